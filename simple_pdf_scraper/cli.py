@@ -12,7 +12,7 @@ import glob
 import argparse
 import warnings
 
-from pathlib import Path
+from functools import lru_cache
 
 from simple_pdf_scraper.output.tsv_writer import TSVWriter
 from simple_pdf_scraper.processors.pypdf_processor import PyPDFProcessor
@@ -28,6 +28,28 @@ def parse_pattern(pattern_str):
         "Total:below:1:line" - Extract entire line 1 line below "Total"
         "Date:left:3:word" - Extract single word 3 words to the left of "Date"
     """
+    keyword, direction, distance, extract_type = _parse_pattern_fields(pattern_str)
+    
+    # A fresh dict for every call, so callers can't alter the cached fields
+    return {
+        'keyword': keyword,
+        'direction': direction,
+        'distance': distance,
+        'extract_type': extract_type
+    }
+
+
+@lru_cache(maxsize=256)
+def _parse_pattern_fields(pattern_str):
+    """
+    Split and validate a pattern string, caching the result.
+    
+    The same pattern strings are parsed again and again when one pattern
+    set is used for many runs, so each string is only validated once.
+    
+    Returns:
+        tuple: (keyword, direction, distance, extract_type)
+    """
     parts = pattern_str.split(':')
     if len(parts) != 4:
         raise ValueError(f"Pattern must have format 'keyword:direction:distance:extract_type', got: {pattern_str}")
@@ -45,26 +67,34 @@ def parse_pattern(pattern_str):
     if extract_type not in ['word', 'number', 'line', 'text']:
         raise ValueError(f"Extract type must be one of: word, number, line, text, got: {extract_type}")
     
-    return {
-        'keyword': keyword.strip(),
-        'direction': direction,
-        'distance': distance,
-        'extract_type': extract_type
-    }
+    return keyword.strip(), direction, distance, extract_type
 
 
 def parse_patterns_file(file_path):
-    """Parse patterns from a file, one pattern per line."""
-    patterns = []
+    """
+    Parse patterns from a file, one pattern per line.
+    
+    Accepts a path or an already open text file (anything with a read()
+    method, such as io.StringIO), which is read without being closed.
+    """
+    if hasattr(file_path, 'read'):
+        return _parse_pattern_lines(file_path)
+    
     with open(file_path, 'r') as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
-            if line and not line.startswith('#'):  # Skip empty lines and comments
-                try:
-                    patterns.append(parse_pattern(line))
-                except ValueError as e:
-                    print(f"Error in patterns file line {line_num}: {e}", file=sys.stderr)
-                    return None
+        return _parse_pattern_lines(f)
+
+
+def _parse_pattern_lines(lines):
+    """Parse patterns from an iterable of lines, skipping blanks and comments."""
+    patterns = []
+    for line_num, line in enumerate(lines, 1):
+        line = line.strip()
+        if line and not line.startswith('#'):  # Skip empty lines and comments
+            try:
+                patterns.append(parse_pattern(line))
+            except ValueError as e:
+                print(f"Error in patterns file line {line_num}: {e}", file=sys.stderr)
+                return None
     return patterns
 
 
@@ -226,6 +256,8 @@ work even though TSV output flattens results into cells.
                        help='Character to insert for normal gaps (default: space)')
     parser.add_argument('--tab-char', default='\t',
                        help='Character to insert for large gaps (default: tab)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Processes to extract the pages of each PDF in parallel (pdfplumber only, 0 for one per CPU)')
     
     # pdfplumber legacy options (fixed thresholds - overrides adaptive mode)
     parser.add_argument('--min-space-distance', type=float,
@@ -242,18 +274,19 @@ work even though TSV output flattens results into cells.
 
 def expand_file_paths(file_patterns):
     """Expand file patterns and return list of actual PDF files."""
-    pdf_files = []
+    pdf_files = set()  # Overlapping patterns can match the same file
     for pattern in file_patterns:
         if '*' in pattern or '?' in pattern:
-            matches = glob.glob(pattern)
-            pdf_files.extend([f for f in matches if f.lower().endswith('.pdf')])
+            # iglob walks the directory with os.scandir and yields names as it
+            # goes, so no intermediate list of every match is built
+            pdf_files.update(f for f in glob.iglob(pattern) if f.lower().endswith('.pdf'))
         else:
-            if pattern.lower().endswith('.pdf') and Path(pattern).exists():
-                pdf_files.append(pattern)
+            if pattern.lower().endswith('.pdf') and os.path.exists(pattern):
+                pdf_files.add(pattern)
             else:
                 print(f"Warning: Skipping non-PDF or non-existent file: {pattern}", file=sys.stderr)
     
-    return sorted(set(pdf_files))  # Remove duplicates and sort
+    return sorted(pdf_files)
 
 
 def main():
@@ -284,7 +317,8 @@ def main():
                     space_char=args.space_char,
                     tab_char=args.tab_char,
                     min_space_distance=args.min_space_distance,
-                    add_space_distance=args.add_space_distance
+                    add_space_distance=args.add_space_distance,
+                    workers=args.workers or None
                 )
             except ImportError:
                 print("Warning: pdfplumber not available, falling back to pypdf", file=sys.stderr)
@@ -365,9 +399,8 @@ def main():
                 for page_num, page_text in enumerate(pages, 1):
                     row = [pdf_file, page_num]
                     
-                    for pattern in patterns:
-                        result = extractor.extract_pattern(page_text, pattern)
-                        row.append(result if result is not None else '')
+                    results = extractor.extract_multiple_patterns(page_text, patterns)
+                    row.extend(result if result is not None else '' for result in results)
                     
                     # Only add row if at least one pattern matched
                     if any(cell != '' for cell in row[2:]):
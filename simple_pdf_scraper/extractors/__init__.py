@@ -2,6 +2,6 @@
 Extractors package - Pattern-based text extraction logic.
 """
 
-from simple_pdf_scraper.extractors.pattern_extractor import PatternExtractor
+from simple_pdf_scraper.extractors.pattern_extractor import PatternExtractor, PreparedText
 
-__all__ = ['PatternExtractor']
+__all__ = ['PatternExtractor', 'PreparedText']
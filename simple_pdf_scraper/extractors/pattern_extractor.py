@@ -4,6 +4,60 @@ Pattern-based text extraction with directional search capabilities.
 
 import re
 
+from bisect import bisect_right
+
+# Common number and word patterns for extraction, compiled once at import
+# and shared by every PatternExtractor instance
+NUMBER_PATTERN = re.compile(r'-?\d+(?:[.,]\d+)*')
+WORD_PATTERN = re.compile(r'\S+')
+
+
+class PreparedText:
+    """
+    Source text split into lines once, for extracting many patterns from it.
+    
+    Created by PatternExtractor.prepare(). Each line's words are split on
+    first use and then reused by every pattern run against the text, and
+    each keyword is located only once.
+    """
+    
+    def __init__(self, text):
+        self.text = text
+        self.lines = text.split('\n')
+        self._line_words = [None] * len(self.lines)
+        self._search_index = None
+        self._keyword_positions = {}
+    
+    def words(self, line_index):
+        """Get the whitespace-separated words of a line, splitting it only once."""
+        words = self._line_words[line_index]
+        if words is None:
+            words = self._line_words[line_index] = self.lines[line_index].split()
+        return words
+    
+    def search_index(self):
+        """
+        Get the lowercased text and the offset where each of its lines starts.
+        
+        Built on first use for case-insensitive searches of the whole text.
+        
+        Returns:
+            tuple: (lower_text, line_offsets)
+        """
+        if self._search_index is None:
+            lower_text = self.text.lower()
+            
+            # Single-character find scans for newlines with memchr, without
+            # building a list of lowercased lines
+            line_offsets = [0]
+            newline_pos = lower_text.find('\n')
+            while newline_pos != -1:
+                line_offsets.append(newline_pos + 1)
+                newline_pos = lower_text.find('\n', newline_pos + 1)
+            
+            self._search_index = (lower_text, line_offsets)
+        return self._search_index
+
 
 class PatternExtractor:
     """
@@ -14,16 +68,30 @@ class PatternExtractor:
     """
     
     def __init__(self):
-        # Common number patterns for extraction
-        self.number_pattern = re.compile(r'-?\d+(?:[.,]\d+)*')
-        self.word_pattern = re.compile(r'\S+')
+        # Precompiled module-level patterns
+        self.number_pattern = NUMBER_PATTERN
+        self.word_pattern = WORD_PATTERN
+    
+    def prepare(self, text):
+        """
+        Split text into lines once so several patterns can reuse the work.
+        
+        Args:
+            text (str or PreparedText): The source text
+        
+        Returns:
+            PreparedText: Prepared text (returned unchanged if already prepared)
+        """
+        if isinstance(text, PreparedText):
+            return text
+        return PreparedText(text)
     
     def extract_pattern(self, text, pattern):
         """
         Extract text based on a pattern specification.
         
         Args:
-            text (str): The source text to search
+            text (str or PreparedText): The source text to search
             pattern (dict): Pattern specification with keys:
                 - keyword: Text to search for
                 - direction: 'left', 'right', 'above', 'below'
@@ -33,16 +101,26 @@ class PatternExtractor:
         Returns:
             str or None: Extracted text, or None if pattern not found
         """
-        keyword = pattern['keyword']
-        direction = pattern['direction']
-        distance = pattern['distance']
-        extract_type = pattern['extract_type']
+        prepared = self.prepare(text)
         
         # Find keyword position
-        keyword_pos = self._find_keyword_position(text, keyword)
+        keyword_pos = self._find_keyword_position(prepared, pattern['keyword'])
+        return self._extract_from_keyword(prepared, keyword_pos, pattern)
+    
+    def _extract_from_keyword(self, text, keyword_pos, pattern):
+        """
+        Extract text for a pattern whose keyword has already been located.
+        
+        Returns:
+            str or None: Extracted text, or None if keyword or target not found
+        """
         if keyword_pos is None:
             return None
         
+        direction = pattern['direction']
+        distance = pattern['distance']
+        extract_type = pattern['extract_type']
+        
         # Calculate target position based on direction
         target_pos = self._calculate_target_position(
             text, keyword_pos, direction, distance
@@ -60,47 +138,83 @@ class PatternExtractor:
         Returns:
             dict or None: Position info with 'line', 'word_index', 'char_start', 'char_end'
         """
-        lines = text.split('\n')
-        
-        for line_idx, line in enumerate(lines):
-            # Case-insensitive search for keyword
-            start_pos = line.lower().find(keyword.lower())
-            if start_pos != -1:
-                # Find the end position of the keyword
-                end_pos = start_pos + len(keyword)
+        prepared = self.prepare(text)
+        
+        # Every pattern using the same keyword shares one lookup
+        keyword_positions = prepared._keyword_positions
+        if keyword not in keyword_positions:
+            keyword_positions[keyword] = self._search_keyword(prepared, keyword)
+        return keyword_positions[keyword]
+    
+    def _search_keyword(self, prepared, keyword):
+        """
+        Search prepared text for the first usable match of a keyword.
+        
+        Each keyword is a single str.find() over the lowercased text, which
+        beats a combined regex alternation for the handful of keywords a
+        pattern file has.
+        
+        Returns:
+            dict or None: Position info, as for _find_keyword_position()
+        """
+        keyword_lower = keyword.lower()
+        
+        # Keywords are matched within a single line
+        if '\n' in keyword_lower:
+            return None
+        
+        lower_text, line_offsets = prepared.search_index()
+        search_from = 0
+        
+        while True:
+            # Case-insensitive search of the whole text, then map the match
+            # back to its line with a binary search of the line offsets
+            match_pos = lower_text.find(keyword_lower, search_from)
+            if match_pos == -1:
+                return None
+            
+            line_idx = bisect_right(line_offsets, match_pos) - 1
+            line = prepared.lines[line_idx]
+            start_pos = match_pos - line_offsets[line_idx]
+            
+            # Find the end position of the keyword
+            end_pos = start_pos + len(keyword)
+            
+            # Find which words the keyword spans
+            words = prepared.words(line_idx)
+            char_pos = 0
+            keyword_start_word = None
+            keyword_end_word = None
+            
+            for word_idx, word in enumerate(words):
+                word_start = char_pos
+                word_end = char_pos + len(word)
                 
-                # Find which words the keyword spans
-                words = line.split()
-                char_pos = 0
-                keyword_start_word = None
-                keyword_end_word = None
+                # Check if keyword starts in this word
+                if keyword_start_word is None and start_pos >= word_start and start_pos < word_end + 1:
+                    keyword_start_word = word_idx
                 
-                for word_idx, word in enumerate(words):
-                    word_start = char_pos
-                    word_end = char_pos + len(word)
-                    
-                    # Check if keyword starts in this word
-                    if keyword_start_word is None and start_pos >= word_start and start_pos < word_end + 1:
-                        keyword_start_word = word_idx
-                    
-                    # Check if keyword ends in this word  
-                    if end_pos <= word_end + 1:  # +1 for space after word
-                        keyword_end_word = word_idx
-                        break
-                    
-                    char_pos = word_end + 1  # +1 for space
+                # Check if keyword ends in this word  
+                if end_pos <= word_end + 1:  # +1 for space after word
+                    keyword_end_word = word_idx
+                    break
                 
-                if keyword_start_word is not None and keyword_end_word is not None:
-                    return {
-                        'line': line_idx,
-                        'word_index': keyword_start_word,  # Where keyword starts
-                        'char_start': start_pos,
-                        'char_end': end_pos,
-                        'line_text': line,
-                        'keyword_end_word': keyword_end_word  # Where keyword ends
-                    }
-        
-        return None
+                char_pos = word_end + 1  # +1 for space
+            
+            if keyword_start_word is not None and keyword_end_word is not None:
+                return {
+                    'line': line_idx,
+                    'word_index': keyword_start_word,  # Where keyword starts
+                    'char_start': start_pos,
+                    'char_end': end_pos,
+                    'line_text': line,
+                    'keyword_end_word': keyword_end_word  # Where keyword ends
+                }
+            
+            # Only the first match in a line is considered - go on to the next line
+            if line_idx + 1 == len(line_offsets):
+                return None
+            search_from = line_offsets[line_idx + 1]
     
     def _calculate_target_position(self, text, keyword_pos, direction, distance):
         """
@@ -109,7 +223,8 @@ class PatternExtractor:
         Returns:
             dict or None: Target position info
         """
-        lines = text.split('\n')
+        prepared = self.prepare(text)
+        lines = prepared.lines
         current_line = keyword_pos['line']
         current_word = keyword_pos['word_index']
         
@@ -124,7 +239,7 @@ class PatternExtractor:
             }
         
         elif direction == 'right':
-            words_in_line = len(lines[current_line].split())
+            words_in_line = len(prepared.words(current_line))
             # Use keyword_end_word if available (for multi-word keywords)
             keyword_end = keyword_pos.get('keyword_end_word', current_word)
             target_word = keyword_end + distance + 1  # +1 to move past the keyword
@@ -166,7 +281,7 @@ class PatternExtractor:
             str or None: Extracted content
         """
         line_text = target_pos['line_text']
-        words = line_text.split()
+        words = self.prepare(text).words(target_pos['line'])
         
         if not words:
             return None
@@ -207,16 +322,22 @@ class PatternExtractor:
         Extract multiple patterns from the same text.
         
         Args:
-            text (str): Source text
+            text (str or PreparedText): Source text
             patterns (list): List of pattern specifications
             
         Returns:
             list: List of extracted results, None for failed extractions
         """
+        # Split the text once for all patterns (and locate each distinct
+        # keyword only once)
+        prepared = self.prepare(text)
         results = []
+        
         for pattern in patterns:
-            result = self.extract_pattern(text, pattern)
+            keyword_pos = self._find_keyword_position(prepared, pattern['keyword'])
+            result = self._extract_from_keyword(prepared, keyword_pos, pattern)
             results.append(result)
+        
         return results
     
     def find_all_keyword_matches(self, text, keyword):
@@ -229,12 +350,13 @@ class PatternExtractor:
             list: List of position dictionaries
         """
         matches = []
-        lines = text.split('\n')
+        prepared = self.prepare(text)
+        keyword_lower = keyword.lower()
         
-        for line_idx, line in enumerate(lines):
-            words = line.split()
+        for line_idx, line in enumerate(prepared.lines):
+            words = prepared.words(line_idx)
             for word_idx, word in enumerate(words):
-                if keyword.lower() in word.lower():
+                if keyword_lower in word.lower():
                     matches.append({
                         'line': line_idx,
                         'word_index': word_idx,
@@ -252,6 +374,7 @@ class PatternExtractor:
             dict: Debug information about the extraction process
         """
         keyword = pattern['keyword']
+        text = self.prepare(text)
         
         # Find keyword
         keyword_pos = self._find_keyword_position(text, keyword)
@@ -5,6 +5,10 @@ TSV output writer for extracted data.
 import csv
 from pathlib import Path
 
+# Number formatting characters ignored when deciding whether a cell is a
+# number, as a translation table built once at import
+NUMBER_FORMAT_CHARS = str.maketrans('', '', ', $')
+
 
 class TSVWriter:
     """
@@ -14,6 +18,9 @@ class TSVWriter:
     making it more reliable for spreadsheet import.
     """
     
+    # The writer keeps no per-instance state, so instances need no __dict__
+    __slots__ = ()
+    
     def __init__(self):
         pass
     
@@ -22,31 +29,40 @@ class TSVWriter:
         Write extraction results to a TSV file.
         
         Args:
-            output_path (str): Path for the output file
+            output_path (str or file): Path for the output file, or an open
+                text file (e.g. io.StringIO) to write to without closing
             headers (list): Column headers
             rows (list): List of data rows, each row is a list of values
             
         Raises:
             IOError: If file cannot be written
         """
+        if hasattr(output_path, 'write'):
+            self._write_rows(output_path, headers, rows)
+            return
+        
         output_path = Path(output_path)
         
         try:
             with open(output_path, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file, delimiter='\t', quoting=csv.QUOTE_MINIMAL)
-                
-                # Write headers
-                writer.writerow(headers)
-                
-                # Write data rows
-                for row in rows:
-                    # Clean and format each cell
-                    cleaned_row = [self._clean_cell_value(cell) for cell in row]
-                    writer.writerow(cleaned_row)
+                self._write_rows(file, headers, rows)
                     
         except IOError as e:
             raise IOError(f"Cannot write to {output_path}: {e}")
     
+    def _write_rows(self, file, headers, rows):
+        """Write headers and cleaned data rows to an open file."""
+        writer = csv.writer(file, delimiter='\t', quoting=csv.QUOTE_MINIMAL)
+        
+        # Write headers
+        writer.writerow(headers)
+        
+        # Write data rows
+        for row in rows:
+            # Clean and format each cell
+            cleaned_row = [self._clean_cell_value(cell) for cell in row]
+            writer.writerow(cleaned_row)
+    
     def append_results(self, output_path, rows):
         """
         Append results to an existing TSV file.
@@ -91,11 +107,10 @@ class TSVWriter:
         # Convert to string
         str_value = str(value)
         
-        # Replace problematic characters
-        # Remove or replace tabs and newlines that would break TSV format
-        str_value = str_value.replace('\t', ' ').replace('\n', ' ').replace('\r', '')
+        # Remove carriage returns that would break TSV format
+        str_value = str_value.replace('\r', '')
         
-        # Normalize whitespace
+        # Normalize whitespace (split() also breaks on the tabs and newlines)
         str_value = ' '.join(str_value.split())
         
         # Handle special cases for numeric data
@@ -105,13 +120,14 @@ class TSVWriter:
         
         return str_value
     
-    def _looks_like_number(self, value):
+    @staticmethod
+    def _looks_like_number(value):
         """Check if a string looks like a number."""
         if not value:
             return False
         
-        # Remove common number formatting characters
-        test_value = value.replace(',', '').replace(' ', '').replace('$', '')
+        # Remove common number formatting characters in a single pass
+        test_value = value.translate(NUMBER_FORMAT_CHARS)
         
         try:
             float(test_value)
@@ -162,22 +178,33 @@ class TSVWriter:
         Returns:
             str: Preview of TSV content
         """
-        preview_lines = []
+        return '\n'.join(self.iter_preview(headers, rows, max_rows))
+    
+    def iter_preview(self, headers, rows, max_rows=5):
+        """
+        Generate the preview one line at a time.
+        
+        Lets callers stop early (e.g. when checking for a value) without
+        cleaning every previewed row or building the joined string.
         
+        Args:
+            headers (list): Column headers
+            rows (list): Data rows
+            max_rows (int): Maximum number of rows to preview
+            
+        Yields:
+            str: Preview lines - headers, data rows, then a summary of omitted rows
+        """
         # Add headers
-        header_line = '\t'.join(str(h) for h in headers)
-        preview_lines.append(header_line)
+        yield '\t'.join(str(h) for h in headers)
         
         # Add data rows (limited)
-        for i, row in enumerate(rows[:max_rows]):
+        for row in rows[:max_rows]:
             cleaned_row = [self._clean_cell_value(cell) for cell in row]
-            row_line = '\t'.join(cleaned_row)
-            preview_lines.append(row_line)
+            yield '\t'.join(cleaned_row)
         
         if len(rows) > max_rows:
-            preview_lines.append(f"... ({len(rows) - max_rows} more rows)")
-        
-        return '\n'.join(preview_lines)
+            yield f"... ({len(rows) - max_rows} more rows)"
     
     def get_stats(self, headers, rows):
         """
@@ -6,9 +6,13 @@ Uses character center positions to identify and remove spatially
 impossible space characters, and add missing spaces where needed.
 """
 
+import os
 import sys
 
 from pathlib import Path
+from itertools import repeat
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     import pdfplumber
@@ -35,7 +39,8 @@ class PDFPlumberProcessor(PDFProcessor):
                  space_char=' ',
                  tab_char='\t',
                  min_space_distance=None,
-                 add_space_distance=None):
+                 add_space_distance=None,
+                 workers=1):
         """
         Initialize the processor with adaptive or fixed spacing thresholds.
         
@@ -48,6 +53,7 @@ class PDFPlumberProcessor(PDFProcessor):
             tab_char (str): Character to insert for large gaps (default: tab)
             min_space_distance (float): Fixed minimum distance (legacy, overrides adaptive)
             add_space_distance (float): Fixed distance threshold (legacy, overrides adaptive)
+            workers (int): Processes to split multi-page PDFs across (None: one per CPU)
             
         Note: 
             Default ratios (1.1× and 1.3×) are empirically tested on real-world problematic PDFs:
@@ -75,6 +81,7 @@ class PDFPlumberProcessor(PDFProcessor):
         self.line_tolerance = line_tolerance
         self.space_char = space_char
         self.tab_char = tab_char
+        self.workers = workers
     
     def extract_pages(self, pdf_path):
         """Extract text from all pages using center-distance filtering."""
@@ -86,13 +93,19 @@ class PDFPlumberProcessor(PDFProcessor):
         
         try:
             with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    try:
-                        text = self._extract_page_with_filtering(page)
-                        pages_text.append(text)
-                    except Exception as page_error:
-                        pages_text.append("")
-                        print(f"Warning: Failed to extract text from page {page_num + 1}: {page_error}", file=sys.stderr)
+                page_count = len(pdf.pages)
+                workers = min(self.workers or os.cpu_count() or 1, page_count)
+                
+                if workers <= 1:
+                    page_results = [self._extract_page_safely(page) for page in pdf.pages]
+            
+            if workers > 1:
+                page_results = self._extract_pages_in_parallel(pdf_path, page_count, workers)
+            
+            for page_num, (text, page_error) in enumerate(page_results):
+                pages_text.append(text)
+                if page_error is not None:
+                    print(f"Warning: Failed to extract text from page {page_num + 1}: {page_error}", file=sys.stderr)
         
         except Exception as e:
             # Handle potential encryption or other PDF access issues
@@ -106,8 +119,65 @@ class PDFPlumberProcessor(PDFProcessor):
         
         return pages_text
     
+    def _extract_pages_in_parallel(self, pdf_path, page_count, workers):
+        """
+        Extract all pages across worker processes, in page order.
+        
+        pdfplumber objects can't be sent between processes, so each task is a
+        range of page indices and its worker opens the PDF itself. Several
+        ranges per worker keep the load balanced without reopening the file
+        for every page.
+        
+        Returns:
+            list: (text, error) tuples as from _extract_page_safely()
+        """
+        chunk_size = max(1, page_count // (4 * workers))
+        starts = range(0, page_count, chunk_size)
+        stops = [min(start + chunk_size, page_count) for start in starts]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = executor.map(_extract_page_range, repeat(self), repeat(str(pdf_path)), starts, stops)
+            return [page_result for chunk in chunks for page_result in chunk]
+    
+    def _extract_page_safely(self, page):
+        """
+        Extract one page's text, catching errors so other pages still get extracted.
+        
+        Returns:
+            tuple: (text, error) - empty text and the error message if extraction failed
+        """
+        try:
+            return self._extract_page_with_filtering(page), None
+        except Exception as page_error:
+            return "", str(page_error)
+    
     def extract_page(self, pdf_path, page_number):
         """Extract text from a specific page using center-distance filtering."""
+        with self.open_page(pdf_path, page_number) as page:
+            return self.extract_page_text(page)
+    
+    @contextmanager
+    def open_page(self, pdf_path, page_number):
+        """
+        Open a PDF and provide one of its pages, closing the PDF afterwards.
+        
+        Lets callers run extract_page_text() on the same page several times
+        (e.g. with different thresholds) while parsing the file only once.
+        Errors raised while the page is open are reported the same way as
+        extract_page() reports them.
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            page_number (int): Page number (1-based)
+        
+        Yields:
+            pdfplumber.page.Page: The requested page
+        
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+            IndexError: If page number is out of range
+            Exception: For any PDF processing errors
+        """
         pdf_path = Path(pdf_path)
         if not pdf_path.exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
@@ -117,8 +187,7 @@ class PDFPlumberProcessor(PDFProcessor):
                 if page_number < 1 or page_number > len(pdf.pages):
                     raise IndexError(f"Page {page_number} out of range (1-{len(pdf.pages)})")
                 
-                page = pdf.pages[page_number - 1]  # Convert to 0-based
-                return self._extract_page_with_filtering(page)
+                yield pdf.pages[page_number - 1]  # Convert to 0-based
                 
         except (IndexError, FileNotFoundError):
             raise
@@ -130,6 +199,18 @@ class PDFPlumberProcessor(PDFProcessor):
             else:
                 raise Exception(f"Error reading page {page_number} from PDF {pdf_path}: {e}")
     
+    def extract_page_text(self, page):
+        """
+        Extract text from an already-open pdfplumber page using center-distance filtering.
+        
+        Args:
+            page (pdfplumber.page.Page): Page provided by open_page()
+        
+        Returns:
+            str: Filtered text of the page
+        """
+        return self._extract_page_with_filtering(page)
+    
     def get_page_count(self, pdf_path):
         """Get page count using pdfplumber."""
         pdf_path = Path(pdf_path)
@@ -253,10 +334,16 @@ class PDFPlumberProcessor(PDFProcessor):
         lines = []
         current_line = [sorted_chars[0]]
         current_y = sorted_chars[0]['y1']
+        unsorted_lines = []  # Lines whose characters are out of X order
         
         for char in sorted_chars[1:]:
             if abs(char['y1'] - current_y) <= self.line_tolerance:
-                # Same line - add to current group
+                # Same line - add to current group. Characters sharing a Y value
+                # already arrive in X order, so only a step back in X (from a
+                # slightly different Y value) means the line needs sorting.
+                if char['x0'] < current_line[-1]['x0']:
+                    if not unsorted_lines or unsorted_lines[-1] is not current_line:
+                        unsorted_lines.append(current_line)
                 current_line.append(char)
             else:
                 # New line - start new group
@@ -268,8 +355,8 @@ class PDFPlumberProcessor(PDFProcessor):
         if current_line:
             lines.append(current_line)
         
-        # Sort characters within each line by X coordinate
-        for line in lines:
+        # Sort characters by X coordinate, skipping lines already in X order
+        for line in unsorted_lines:
             line.sort(key=lambda c: c['x0'])
         
         return lines
@@ -322,23 +409,20 @@ class PDFPlumberProcessor(PDFProcessor):
     
     def _calculate_average_character_spacing(self, char_data):
         """Calculate the average spacing between adjacent non-space characters."""
-        non_space_chars = [c for c in char_data if not c['is_space']]
+        non_space_centers = [c['center'] for c in char_data if not c['is_space']]
         
-        if len(non_space_chars) < 2:
+        if len(non_space_centers) < 2:
             return 4.8  # Fallback to typical 12pt font spacing
         
-        # Calculate spacings between adjacent non-space characters
-        spacings = []
-        for i in range(1, len(non_space_chars)):
-            spacing = non_space_chars[i]['center'] - non_space_chars[i-1]['center']
-            # Only include reasonable spacings (filter out huge gaps)
-            if spacing > 0 and spacing < 50:  # Reasonable character spacing range
-                spacings.append(spacing)
+        # Calculate spacings between adjacent non-space characters, keeping only
+        # the reasonable character spacing range (filter out huge gaps)
+        spacings = [s for a, b in zip(non_space_centers, non_space_centers[1:]) if 0 < (s := b - a) < 50]
         
         if not spacings:
             return 4.8  # Fallback
         
-        # Use median to avoid being skewed by outliers
+        # Use median to avoid being skewed by outliers. Lines are short, so
+        # sorting in C beats a pure-Python O(n) selection.
         spacings.sort()
         mid = len(spacings) // 2
         if len(spacings) % 2 == 0:
@@ -349,76 +433,96 @@ class PDFPlumberProcessor(PDFProcessor):
     def _apply_center_distance_filtering(self, char_data, min_space_distance, add_space_distance):
         """Apply center-distance filtering with specified thresholds."""
         result_chars = []
-        i = 0
+        append = result_chars.append
+        prev_nonspace, next_nonspace = self._find_adjacent_non_space_indices(char_data)
         
-        while i < len(char_data):
-            current_char = char_data[i]
-            
+        for i, current_char in enumerate(char_data):
             if current_char['is_space']:
                 # This is a space character - decide whether to keep it
-                if self._should_keep_space(char_data, i, min_space_distance):
-                    result_chars.append(' ')
+                if self._should_keep_space(char_data, prev_nonspace[i], next_nonspace[i], min_space_distance):
+                    append(' ')
             else:
                 # This is a non-space character - always add it
-                result_chars.append(current_char['text'])
+                append(current_char['text'])
                 
                 # Check if we need to add a space after this character
                 if self._should_add_space_after(char_data, i, add_space_distance):
-                    result_chars.append(' ')
-            
-            i += 1
+                    append(' ')
         
         return ''.join(result_chars)
     
     def _apply_enhanced_center_distance_filtering(self, char_data, min_space_distance, add_space_distance, add_tab_distance):
         """Apply enhanced center-distance filtering with tab insertion."""
         result_chars = []
-        i = 0
+        append = result_chars.append
+        prev_nonspace, next_nonspace = self._find_adjacent_non_space_indices(char_data)
         
-        while i < len(char_data):
-            current_char = char_data[i]
-            
+        # Per-line values, looked up once rather than for every character
+        centers = [c['center'] for c in char_data]
+        last_index = len(char_data) - 1
+        space_char = self.space_char
+        tab_char = self.tab_char
+        
+        for i, current_char in enumerate(char_data):
             if current_char['is_space']:
-                # This is a space character - decide whether to keep it
-                if self._should_keep_space(char_data, i, min_space_distance):
-                    result_chars.append(self.space_char)
+                # This is a space character - keep it if it lacks a non-space
+                # neighbour on either side, or if those neighbours are far enough apart
+                prev_index = prev_nonspace[i]
+                next_index = next_nonspace[i]
+                if (prev_index == -1 or next_index == -1 or
+                        centers[next_index] - centers[prev_index] >= min_space_distance):
+                    append(space_char)
             else:
                 # This is a non-space character - always add it
-                result_chars.append(current_char['text'])
+                append(current_char['text'])
                 
-                # Check what separator (if any) to add after this character
-                separator = self._get_separator_to_add(char_data, i, add_space_distance, add_tab_distance)
-                if separator:
-                    result_chars.append(separator)
-            
-            i += 1
+                # Check what separator (if any) to add before the next character,
+                # unless this is the last character or a space already follows
+                if i < last_index and not char_data[i + 1]['is_space']:
+                    distance = centers[i + 1] - centers[i]
+                    if distance >= add_tab_distance:
+                        append(tab_char)  # Large gap = structural boundary
+                    elif distance >= add_space_distance:
+                        append(space_char)  # Medium gap = missing space
         
         return ''.join(result_chars)
     
-    def _should_keep_space(self, char_data, space_index, min_space_distance):
-        """Determine if a space should be kept based on adjacent character distances."""
-        # Find the non-space characters before and after this space
-        prev_char = None
-        next_char = None
+    def _find_adjacent_non_space_indices(self, char_data):
+        """
+        Find the nearest non-space characters around each position.
         
-        # Look backwards for previous non-space character
-        for i in range(space_index - 1, -1, -1):
+        One forward and one backward pass replace scanning out from every
+        space in both directions, keeping line filtering linear.
+        
+        Returns:
+            tuple: (prev_nonspace, next_nonspace) index lists, -1 where none exists
+        """
+        count = len(char_data)
+        prev_nonspace = [-1] * count
+        next_nonspace = [-1] * count
+        
+        last_index = -1
+        for i in range(count):
+            prev_nonspace[i] = last_index
             if not char_data[i]['is_space']:
-                prev_char = char_data[i]
-                break
+                last_index = i
         
-        # Look forwards for next non-space character
-        for i in range(space_index + 1, len(char_data)):
+        last_index = -1
+        for i in range(count - 1, -1, -1):
+            next_nonspace[i] = last_index
             if not char_data[i]['is_space']:
-                next_char = char_data[i]
-                break
+                last_index = i
         
-        # If we can't find both adjacent characters, keep the space
-        if prev_char is None or next_char is None:
+        return prev_nonspace, next_nonspace
+    
+    def _should_keep_space(self, char_data, prev_index, next_index, min_space_distance):
+        """Determine if a space should be kept based on adjacent character distances."""
+        # If we can't find both adjacent non-space characters, keep the space
+        if prev_index == -1 or next_index == -1:
             return True
         
         # Calculate center-to-center distance between adjacent non-space characters
-        distance = next_char['center'] - prev_char['center']
+        distance = char_data[next_index]['center'] - char_data[prev_index]['center']
         
         # Keep space if there's enough distance between the adjacent characters
         return distance >= min_space_distance
@@ -442,30 +546,6 @@ class PDFPlumberProcessor(PDFProcessor):
         # Add space if distance is large enough
         return distance >= add_space_distance
     
-    def _get_separator_to_add(self, char_data, char_index, add_space_distance, add_tab_distance):
-        """Determine what separator (if any) should be added after a character."""
-        # Don't add separator after the last character
-        if char_index >= len(char_data) - 1:
-            return None
-        
-        current_char = char_data[char_index]
-        next_char = char_data[char_index + 1]
-        
-        # Don't add separator if next character is already a space
-        if next_char['is_space']:
-            return None
-        
-        # Calculate center-to-center distance
-        distance = next_char['center'] - current_char['center']
-        
-        # Determine appropriate separator based on distance
-        if distance >= add_tab_distance:
-            return self.tab_char  # Large gap = structural boundary
-        elif distance >= add_space_distance:
-            return self.space_char  # Medium gap = missing space
-        else:
-            return None  # Small gap = no separator needed
-    
     def get_processor_info(self):
         """Return information about this processor."""
         if self.adaptive_mode:
@@ -495,4 +575,10 @@ class PDFPlumberProcessor(PDFProcessor):
                 'tab_char': repr(self.tab_char)
             }
 
+
+def _extract_page_range(processor, pdf_path, start, stop):
+    """Process pool worker - extract pages start to stop-1 with one open of the PDF."""
+    with pdfplumber.open(pdf_path) as pdf:
+        return [processor._extract_page_safely(page) for page in pdf.pages[start:stop]]
+
 # End of file #
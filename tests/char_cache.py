@@ -0,0 +1,195 @@
+"""
+On-disk cache of pdfplumber page characters for the debugging scripts.
+File: tests/char_cache.py
+
+Parsing the PDF dominates the run time of the character-level debugging
+scripts, so the page.chars list is pickled to a per-user cache directory
+keyed by the file's path, modification time and size. Editing or replacing
+the PDF changes the key, so stale entries are never returned.
+
+Only the position and text fields the scripts use are kept, which makes
+each cached character a fraction of the size of pdfplumber's full record.
+
+Loaded pages are also memoized in-process, so scripts and test modules
+that ask for the same page more than once only read the cache file once.
+
+The per-line helpers the filtering scripts share for working with the
+cached characters live here too.
+"""
+
+import os
+import pickle
+import hashlib
+
+from pathlib import Path
+from operator import itemgetter
+from functools import lru_cache
+from collections import defaultdict
+
+try:
+    import pdfplumber
+except ImportError:
+    pdfplumber = None
+
+
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'simple_pdf_scraper' / 'chars'
+
+# Character fields kept from pdfplumber's page.chars records
+CHAR_FIELDS = ('x0', 'x1', 'y0', 'y1', 'text')
+
+
+def _cache_path(pdf_file, page_index):
+    """Build the cache file path for one page of a PDF file."""
+    pdf_path = Path(pdf_file).resolve()
+    stat = pdf_path.stat()
+    key = f"{pdf_path}:{stat.st_mtime_ns}:{stat.st_size}:{page_index}:{','.join(CHAR_FIELDS)}"
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{digest}.pkl"
+
+
+def get_chars_cached(pdf_file, page_index=0):
+    """
+    Get pdfplumber characters for a page, reusing a cached copy when possible.
+    
+    Args:
+        pdf_file (str): Path to the PDF file
+        page_index (int): Page index (0-based)
+    
+    Returns:
+        list: Character dictionaries limited to the CHAR_FIELDS keys. The
+            list is shared between callers and must not be modified.
+    
+    Raises:
+        FileNotFoundError: If PDF file doesn't exist
+        ImportError: If pdfplumber is needed but not installed
+    """
+    # The cache path encodes the file's modification time and size, so a
+    # changed PDF never hits a stale in-process entry either
+    cache_path = _cache_path(pdf_file, page_index)
+    return _load_chars(cache_path, str(pdf_file), page_index)
+
+
+@lru_cache(maxsize=32)
+def _load_chars(cache_path, pdf_file, page_index):
+    """Load one page's characters from the cache file, or parse and store them."""
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass  # Cache miss (or unreadable entry) - fall back to parsing
+    
+    if pdfplumber is None:
+        raise ImportError("pdfplumber is required. Install with: pip install pdfplumber")
+    
+    with pdfplumber.open(pdf_file) as pdf:
+        chars = [{field: char[field] for field in CHAR_FIELDS}
+                 for char in pdf.pages[page_index].chars]
+    
+    # Caching is best effort - write to a temporary name, then move into place
+    temp_path = cache_path.with_suffix('.tmp')
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            pickle.dump(chars, f, protocol=pickle.HIGHEST_PROTOCOL)
+        temp_path.replace(cache_path)
+    except (OSError, TypeError, pickle.PicklingError):
+        temp_path.unlink(missing_ok=True)
+    
+    return chars
+
+
+def group_characters_by_line(chars, line_tolerance=2.0):
+    """
+    Group characters into lines based on Y coordinate.
+    
+    Args:
+        chars (list): List of character dictionaries with x0, x1, y0, y1, text
+        line_tolerance (float): Y-coordinate tolerance for grouping
+        
+    Returns:
+        list: List of character groups (lines)
+    """
+    if not chars:
+        return []
+    
+    # Bucket characters by exact Y coordinate in one pass. A page has far
+    # fewer distinct Y values than characters, so only those get sorted.
+    buckets = defaultdict(list)
+    for char in chars:
+        buckets[char['y1']].append(char)
+    
+    lines = []
+    current_line = None
+    current_y = None
+    
+    # Walk the Y values top to bottom, merging buckets within the tolerance
+    # of the current line's first Y value
+    for y in sorted(buckets, reverse=True):
+        if current_line is not None and abs(y - current_y) <= line_tolerance:
+            # Same line - add to current group
+            current_line.extend(buckets[y])
+        else:
+            # New line - start new group
+            current_line = buckets[y]
+            current_y = y
+            lines.append(current_line)
+    
+    # Sort characters within each line by X coordinate
+    return [sorted(line, key=itemgetter('x0')) for line in lines]
+
+
+def char_arrays(chars):
+    """
+    Split characters into parallel text, center and is-space lists.
+    
+    Args:
+        chars (list): Character dictionaries with x0, x1 and text
+    
+    Returns:
+        tuple: (texts, centers, is_space) lists in the same order as chars
+    """
+    texts = []
+    centers = []
+    is_space = []
+    
+    for char in chars:
+        text = char['text']
+        texts.append(text)
+        centers.append((char['x0'] + char['x1']) / 2)
+        is_space.append(text == ' ')
+    
+    return texts, centers, is_space
+
+
+def find_adjacent_non_space_indices(is_space):
+    """
+    Find the nearest non-space characters around each position.
+    
+    One forward and one backward pass give every space its neighbours up
+    front, so the filter never has to scan for them.
+    
+    Args:
+        is_space (list): Whether each character is a space
+        
+    Returns:
+        tuple: (prev_nonspace, next_nonspace) index lists, -1 where none exists
+    """
+    count = len(is_space)
+    prev_nonspace = [-1] * count
+    next_nonspace = [-1] * count
+    
+    last_index = -1
+    for i in range(count):
+        prev_nonspace[i] = last_index
+        if not is_space[i]:
+            last_index = i
+    
+    last_index = -1
+    for i in range(count - 1, -1, -1):
+        next_nonspace[i] = last_index
+        if not is_space[i]:
+            last_index = i
+    
+    return prev_nonspace, next_nonspace
+
+# End of file #
@@ -0,0 +1,38 @@
+"""
+Pytest integration for the hand-rolled test modules.
+File: tests/conftest.py
+
+The unit test modules keep their own runner, and each test function
+returns a (success, message) tuple instead of asserting. Pytest ignores
+return values, so without this hook a failing test would still pass
+under pytest. With it, every test function is a separate pytest item
+that fails with its message, so the suite can also be sharded across
+workers (pytest -n auto).
+"""
+
+import functools
+
+import pytest
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Let pytest make the usual call, failing the item if the test returns (False, message)."""
+    test_function = pyfuncitem.obj
+    
+    @functools.wraps(test_function)
+    def check_result(*args, **kwargs):
+        result = test_function(*args, **kwargs)
+        if isinstance(result, tuple) and len(result) == 2 and isinstance(result[0], bool):
+            success, message = result
+            if not success:
+                pytest.fail(message, pytrace=False)
+        # Nothing is returned, so pytest doesn't warn about the tuple
+    
+    pyfuncitem.obj = check_result
+    try:
+        yield
+    finally:
+        pyfuncitem.obj = test_function
+
+# End of file #
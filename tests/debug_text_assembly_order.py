@@ -17,6 +17,13 @@ except ImportError:
     print("Error: pdfplumber not available")
     sys.exit(1)
 
+from char_cache import get_chars_cached
+
+
+# Vertical distance (in points) within which words share a line, as in
+# pdfplumber's default y_tolerance
+Y_TOLERANCE = 3
+
 
 def debug_actual_text_order(pdf_file):
     """Debug the actual text assembly order."""
@@ -28,11 +35,24 @@ def debug_actual_text_order(pdf_file):
         with pdfplumber.open(pdf_file) as pdf:
             page = pdf.pages[0]
             
-            # Get the actual extracted text
-            extracted_text = page.extract_text()
+            # Get words in content stream order rather than letting pdfplumber
+            # re-sort the whole page, which scrambles multi-column layouts
+            words = page.extract_words(use_text_flow=True, keep_blank_chars=False)
+            
+            # Consecutive words within pdfplumber's default y_tolerance of the
+            # line's first word make up one line (rounding each baseline would
+            # split lines whose glyphs jitter across a .5 boundary)
+            line_groups = []
+            line_bottom = None
+            for word in words:
+                if line_bottom is None or abs(word['bottom'] - line_bottom) > Y_TOLERANCE:
+                    line_groups.append([])
+                    line_bottom = word['bottom']
+                line_groups[-1].append(word['text'])
+            
+            lines = [' '.join(line_words) for line_words in line_groups]
             
             # Find the problematic line
-            lines = extracted_text.splitlines()
             problem_line = None
             line_index = None
             
@@ -54,39 +74,46 @@ def debug_actual_text_order(pdf_file):
             print("Characters in extracted text order:")
             print("-" * 40)
             
-            for i, char in enumerate(problem_line):
-                print(f"  {i:2}: '{char}' ({ord(char):3}) {repr(char)}")
+            # Format all rows first and print them in one call
+            print('\n'.join(f"  {i:2}: '{char}' ({ord(char):3}) {char!r}"
+                            for i, char in enumerate(problem_line)))
             
             # Now try to correlate with PDF character positions
             print(f"\nTrying to correlate with PDF positions...")
             
-            # Get all characters and sort by reading order (Y then X)
-            chars = page.chars
-            sorted_chars = sorted(chars, key=lambda c: (-c['y0'], c['x0']))
+            # Chars are almost always single glyphs, so a set lookup replaces
+            # scanning the whole line (multi-glyph text such as ligatures and
+            # empty text keep the substring test)
+            problem_glyphs = frozenset(problem_line)
+            
+            def in_problem_line(text):
+                return text in problem_glyphs if len(text) == 1 else text in problem_line
             
-            # Find characters in the problematic line (same Y coordinate)
-            problem_y = None
+            # Filter the page's characters first so only the candidates get
+            # sorted, rather than the whole page
+            candidates = [char for char in page.chars if in_problem_line(char['text'])]
             problem_chars = []
             
-            for char in sorted_chars:
-                if char['text'] in problem_line:
-                    if problem_y is None:
-                        problem_y = char['y0']
-                    
-                    # Include chars within 2 points of the line Y coordinate
-                    if abs(char['y0'] - problem_y) < 2.0:
-                        problem_chars.append(char)
+            if candidates:
+                # The topmost candidate gives the line's Y coordinate; include
+                # chars within 2 points of it
+                problem_y = max(char['y0'] for char in candidates)
+                problem_chars = [char for char in candidates if problem_y - char['y0'] < 2.0]
             
-            # Sort problem chars by X coordinate (reading order)
-            problem_chars.sort(key=lambda c: c['x0'])
+            # Sort problem chars by X coordinate (reading order), top to bottom on ties
+            problem_chars.sort(key=lambda c: (c['x0'], -c['y0']))
             
             print(f"\nCharacters sorted by reading order (X coordinate):")
             print("-" * 50)
             
+            rows = []
             for i, char in enumerate(problem_chars):
                 x = char['x0']
                 text = char['text']
-                print(f"  {i:2}: x={x:6.1f} '{text}' ({ord(text):3}) {repr(text)}")
+                rows.append(f"  {i:2}: x={x:6.1f} '{text}' ({ord(text):3}) {text!r}")
+            
+            if rows:
+                print('\n'.join(rows))
             
             # Try to build the text as pdfplumber would
             reading_order_text = ''.join(char['text'] for char in problem_chars)
@@ -106,32 +133,34 @@ def debug_character_overlaps(pdf_file):
     print("=" * 40)
     
     try:
-        with pdfplumber.open(pdf_file) as pdf:
-            page = pdf.pages[0]
-            chars = page.chars
-            
-            # Focus on date area around y=724
-            date_chars = [c for c in chars if 723 < c['y0'] < 725]
-            date_chars.sort(key=lambda c: c['x0'])
-            
-            print(f"Found {len(date_chars)} characters in date area:")
-            
-            for i, char in enumerate(date_chars):
-                x0 = char['x0']
-                x1 = char.get('x1', x0 + char.get('width', 0))
-                text = char['text']
-                
-                print(f"  {i:2}: x={x0:6.1f}-{x1:6.1f} '{text}'")
+        chars = get_chars_cached(pdf_file)
+        
+        # Focus on date area around y=724
+        date_chars = [c for c in chars if 723 < c['y0'] < 725]
+        date_chars.sort(key=lambda c: c['x0'])
+        
+        print(f"Found {len(date_chars)} characters in date area:")
+        
+        rows = []
+        for i, char in enumerate(date_chars):
+            x0 = char['x0']
+            x1 = char.get('x1', x0 + char.get('width', 0))
+            text = char['text']
+            
+            rows.append(f"  {i:2}: x={x0:6.1f}-{x1:6.1f} '{text}'")
+            
+            # Check for overlaps
+            if i > 0:
+                prev_char = date_chars[i-1]
+                prev_x1 = prev_char.get('x1', prev_char['x0'] + prev_char.get('width', 0))
                 
-                # Check for overlaps
-                if i > 0:
-                    prev_char = date_chars[i-1]
-                    prev_x1 = prev_char.get('x1', prev_char['x0'] + prev_char.get('width', 0))
-                    
-                    if x0 < prev_x1:
-                        overlap = prev_x1 - x0
-                        print(f"       *** OVERLAP: {overlap:.1f} points with previous character ***")
-            
+                if x0 < prev_x1:
+                    overlap = prev_x1 - x0
+                    rows.append(f"       *** OVERLAP: {overlap:.1f} points with previous character ***")
+        
+        if rows:
+            print('\n'.join(rows))
+        
     except Exception as e:
         print(f"Error: {e}")
 
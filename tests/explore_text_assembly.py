@@ -1,30 +1,49 @@
 #!/usr/bin/env python3
 """
-Explore how pypdf assembles text from PDF objects.
+Explore how PDF libraries assemble text from PDF objects.
 File: tests/explore_text_assembly.py
 
-Investigates the granularity at which pypdf extracts text and whether
-we can intercept or influence the assembly process.
+Investigates the granularity at which text is extracted and whether
+we can intercept or influence the assembly process. Uses PyMuPDF when
+available (its text extraction runs in C), with pypdf selectable via
+--engine for comparison.
 """
 
+import io
+import os
 import sys
+import mmap
 
 from pathlib import Path
 
+try:
+    import pymupdf
+except ImportError:
+    try:
+        import fitz as pymupdf  # PyMuPDF releases before 1.24 only provide 'fitz'
+    except ImportError:
+        pymupdf = None
+
 try:
     import pypdf
 except ImportError:
-    print("Error: pypdf not installed. Run: pip install pypdf")
-    sys.exit(1)
+    pypdf = None
+
+
+ENGINES = {'pymupdf': pymupdf, 'pypdf': pypdf}
+DEFAULT_ENGINE = 'pymupdf' if pymupdf is not None else 'pypdf'
 
 
-def test_basic_text_extraction(page):
+def test_basic_text_extraction(page, engine=DEFAULT_ENGINE):
     """Test the basic text extraction to see what we get."""
     print("BASIC TEXT EXTRACTION:")
     print("=" * 40)
     
-    # Standard extraction
-    text = page.extract_text()
+    # Standard extraction (PyMuPDF sorted into reading order)
+    if engine == 'pymupdf':
+        text = page.get_text("text", sort=True)
+    else:
+        text = page.extract_text()
     
     print(f"Total characters: {len(text)}")
     print(f"Total lines: {len(text.splitlines())}")
@@ -68,47 +87,87 @@ def test_visitor_text_granularity(page):
         result = page.extract_text(visitor_text=capture_visitor)
         
         print(f"✓ Visitor pattern works!")
-        print(f"Total chunks captured: {len(text_chunks)}")
-        print(f"Result length: {len(result)} characters")
+        show_chunk_analysis(text_chunks, positions, len(result))
+        
+        return True, text_chunks, positions
         
-        # Analyze chunk sizes
-        chunk_sizes = [len(chunk) for chunk in text_chunks]
-        print(f"Chunk size range: {min(chunk_sizes)} to {max(chunk_sizes)} characters")
+    except Exception as e:
+        print(f"✗ Visitor pattern failed: {e}")
+        return False, [], []
+
+
+def test_span_text_granularity(page):
+    """Test what granularity PyMuPDF's text spans give us."""
+    print("\n\nSPAN GRANULARITY:")
+    print("=" * 40)
+    
+    text_chunks = []
+    positions = []
+    
+    try:
+        # One C-level call returns the block/line/span hierarchy with positions.
+        # No sorting here, so spans stay in content stream order like the visitor.
+        page_dict = page.get_text("dict")
         
-        # Show first few chunks with positions
-        print(f"\nFirst 10 chunks:")
-        for i, (chunk, pos) in enumerate(zip(text_chunks[:10], positions[:10])):
-            x, y = pos
-            pos_str = f"({x:.1f}, {y:.1f})" if x is not None else "(?, ?)"
-            print(f"  {i+1:2}: {pos_str:12} '{chunk}'")
+        for block in page_dict['blocks']:
+            for line in block.get('lines', []):
+                for span in line['spans']:
+                    text = span['text']
+                    if text and text.strip():
+                        text_chunks.append(text)
+                        x, y = span['origin']
+                        positions.append((x, y))
         
-        # Look for position jumps that might indicate concatenation issues
-        if len(positions) > 1:
-            print(f"\nPosition analysis:")
-            big_jumps = 0
-            for i in range(1, len(positions)):
-                x1, y1 = positions[i-1]
-                x2, y2 = positions[i]
-                
-                if x1 is not None and x2 is not None:
-                    x_jump = abs(x2 - x1)
-                    y_jump = abs(y2 - y1)
-                    
-                    if x_jump > 50:  # Arbitrary threshold
-                        big_jumps += 1
-                        if big_jumps <= 5:  # Show first 5
-                            print(f"  Big X jump ({x_jump:.1f}): '{text_chunks[i-1]}' → '{text_chunks[i]}'")
-            
-            if big_jumps > 5:
-                print(f"  ... and {big_jumps - 5} more big jumps")
+        print(f"✓ Span extraction works!")
+        show_chunk_analysis(text_chunks, positions, sum(len(chunk) for chunk in text_chunks))
         
         return True, text_chunks, positions
         
     except Exception as e:
-        print(f"✗ Visitor pattern failed: {e}")
+        print(f"✗ Span extraction failed: {e}")
         return False, [], []
 
 
+def show_chunk_analysis(text_chunks, positions, result_length):
+    """Show chunk counts, sizes and big position jumps between chunks."""
+    print(f"Total chunks captured: {len(text_chunks)}")
+    print(f"Result length: {result_length} characters")
+    
+    if not text_chunks:
+        return
+    
+    # Analyze chunk sizes
+    chunk_sizes = [len(chunk) for chunk in text_chunks]
+    print(f"Chunk size range: {min(chunk_sizes)} to {max(chunk_sizes)} characters")
+    
+    # Show first few chunks with positions
+    print(f"\nFirst 10 chunks:")
+    for i, (chunk, pos) in enumerate(zip(text_chunks[:10], positions[:10])):
+        x, y = pos
+        pos_str = f"({x:.1f}, {y:.1f})" if x is not None else "(?, ?)"
+        print(f"  {i+1:2}: {pos_str:12} '{chunk}'")
+    
+    # Look for position jumps that might indicate concatenation issues
+    if len(positions) > 1:
+        print(f"\nPosition analysis:")
+        big_jumps = 0
+        for i in range(1, len(positions)):
+            x1, y1 = positions[i-1]
+            x2, y2 = positions[i]
+            
+            if x1 is not None and x2 is not None:
+                x_jump = abs(x2 - x1)
+                y_jump = abs(y2 - y1)
+                
+                if x_jump > 50:  # Arbitrary threshold
+                    big_jumps += 1
+                    if big_jumps <= 5:  # Show first 5
+                        print(f"  Big X jump ({x_jump:.1f}): '{text_chunks[i-1]}' → '{text_chunks[i]}'")
+        
+        if big_jumps > 5:
+            print(f"  ... and {big_jumps - 5} more big jumps")
+
+
 def test_manual_assembly(text_chunks, positions):
     """Test manually assembling text with better spacing logic."""
     print("\n\nMANUAL ASSEMBLY TEST:")
@@ -118,34 +177,27 @@ def test_manual_assembly(text_chunks, positions):
         print("No chunks to assemble")
         return ""
     
-    assembled_parts = []
-    
-    for i, (chunk, pos) in enumerate(zip(text_chunks, positions)):
-        # Add the current chunk
-        assembled_parts.append(chunk)
+    # Compare each chunk's position with the next one in a single pairwise pass
+    add_space_after = []
+    for chunk, next_chunk, (current_x, current_y), (next_x, next_y) in zip(
+            text_chunks, text_chunks[1:], positions, positions[1:]):
+        if current_x is None or next_x is None:
+            add_space_after.append(False)
+            continue
         
-        # Decide whether to add spacing before next chunk
-        if i < len(text_chunks) - 1:  # Not the last chunk
-            current_x, current_y = pos
-            next_x, next_y = positions[i + 1]
-            
-            # Add spacing logic
-            should_add_space = False
-            
-            if current_x is not None and next_x is not None:
-                x_jump = abs(next_x - current_x)
-                y_jump = abs(next_y - current_y) if next_y is not None else 0
-                
-                # Add space for big horizontal jumps (different columns/boxes)
-                if x_jump > 20:  # Configurable threshold
-                    should_add_space = True
-                
-                # Add space for line breaks if text doesn't end/start with whitespace
-                elif y_jump > 5 and not chunk.endswith(' ') and not text_chunks[i+1].startswith(' '):
-                    should_add_space = True
-            
-            if should_add_space:
-                assembled_parts.append(' ')
+        x_jump = abs(next_x - current_x)
+        y_jump = abs(next_y - current_y) if next_y is not None else 0
+        
+        # Add space for big horizontal jumps (different columns/boxes), or for
+        # line breaks if text doesn't end/start with whitespace
+        add_space_after.append(
+            x_jump > 20 or  # Configurable threshold
+            (y_jump > 5 and not chunk.endswith(' ') and not next_chunk.startswith(' '))
+        )
+    add_space_after.append(False)  # Nothing follows the last chunk
+    
+    assembled_parts = [chunk + ' ' if add_space else chunk
+                       for chunk, add_space in zip(text_chunks, add_space_after)]
     
     manually_assembled = ''.join(assembled_parts)
     
@@ -172,27 +224,44 @@ def test_manual_assembly(text_chunks, positions):
     return manually_assembled
 
 
-def explore_text_assembly(pdf_file):
+def explore_text_assembly(pdf_file, engine=DEFAULT_ENGINE):
     """Main exploration of text assembly process."""
     print(f"EXPLORING TEXT ASSEMBLY: {pdf_file}")
+    print(f"Engine: {engine}")
     print("=" * 60)
     
     try:
-        with open(pdf_file, 'rb') as file:
-            reader = pypdf.PdfReader(file)
-            
-            if len(reader.pages) == 0:
+        if engine == 'pymupdf':
+            document = pymupdf.open(pdf_file)
+            pages = document
+        else:
+            # Map the file so pypdf's many small seeks and reads are served
+            # from memory; the mapping stays valid after the file is closed.
+            # An empty file can't be mapped, so pypdf gets an empty buffer
+            # and reports it like any other unreadable PDF.
+            with open(pdf_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    document = io.BytesIO()
+                else:
+                    document = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            pages = pypdf.PdfReader(document).pages
+        
+        with document:
+            if len(pages) == 0:
                 print("✗ PDF has no pages")
                 return False
             
-            page = reader.pages[0]
+            page = pages[0]
             print(f"✓ Using first page")
             
             # Test basic extraction
-            basic_text = test_basic_text_extraction(page)
+            basic_text = test_basic_text_extraction(page, engine)
             
-            # Test visitor granularity
-            visitor_worked, chunks, positions = test_visitor_text_granularity(page)
+            # Test chunk granularity
+            if engine == 'pymupdf':
+                visitor_worked, chunks, positions = test_span_text_granularity(page)
+            else:
+                visitor_worked, chunks, positions = test_visitor_text_granularity(page)
             
             if visitor_worked:
                 # Test manual assembly
@@ -222,32 +291,42 @@ def main():
     print("Text Assembly Explorer")
     print("=" * 40)
     
-    if len(sys.argv) != 2:
-        print("Usage: python explore_text_assembly.py <pdf_file>")
-        print("\nThis script investigates how pypdf assembles text from PDF objects")
+    args = sys.argv[1:]
+    engine = DEFAULT_ENGINE
+    if len(args) == 3 and args[1] == '--engine':
+        engine = args[2]
+        args = args[:1]
+    
+    if len(args) != 1 or engine not in ENGINES:
+        print("Usage: python explore_text_assembly.py <pdf_file> [--engine pymupdf|pypdf]")
+        print("\nThis script investigates how PDF libraries assemble text from PDF objects")
         print("and whether we can intercept the process to add better spacing.")
         return 1
     
-    pdf_file = sys.argv[1]
+    if ENGINES[engine] is None:
+        print(f"Error: {engine} not installed. Run: pip install {engine}")
+        return 1
+    
+    pdf_file = args[0]
     
     if not Path(pdf_file).exists():
         print(f"Error: File not found: {pdf_file}")
         return 1
     
-    success = explore_text_assembly(pdf_file)
+    success = explore_text_assembly(pdf_file, engine)
     
     print("\n" + "=" * 60)
     print("CONCLUSIONS:")
     print("=" * 60)
     
     if success:
-        print("✓ We can intercept pypdf's text assembly process!")
+        print(f"✓ We can intercept {engine}'s text assembly process!")
         print("✓ Text comes in chunks with position information")
         print("✓ We can add intelligent spacing based on coordinate jumps")
         print("✓ This is much simpler than complex pattern matching")
         print("\nNext step: Implement coordinate-threshold spacing")
     else:
-        print("✗ Cannot intercept pypdf's text assembly")
+        print(f"✗ Cannot intercept {engine}'s text assembly")
         print("✗ Must fall back to pattern-based fixes")
         print("✗ Or try alternative PDF libraries")
     
@@ -105,12 +105,11 @@ Thank you for your business!"""
         }
     ]
     
-    # Extract using each pattern
-    for item in patterns:
+    # Extract all patterns together so shared keywords are only located once
+    results = extractor.extract_multiple_patterns(sample_text, [item['pattern'] for item in patterns])
+    
+    for item, result in zip(patterns, results):
         name = item['name']
-        pattern = item['pattern']
-        
-        result = extractor.extract_pattern(sample_text, pattern)
         
         print(f"{name:15}: {result if result else '(not found)'}")
     
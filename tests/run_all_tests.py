@@ -5,9 +5,13 @@ Master test runner that executes all test modules and provides
 a combined score and summary.
 """
 
+import io
 import sys
+import importlib
 
 from pathlib import Path
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
 
 # Add both current directory (for test modules) and parent directory (for package) to path
 current_dir = Path(__file__).parent
@@ -16,9 +20,24 @@ parent_dir = current_dir.parent
 sys.path.insert(0, str(current_dir))  # For importing test modules
 sys.path.insert(0, str(parent_dir))   # For importing simple_pdf_scraper package
 
-import test_processors
-import test_extractors
-import test_integration
+
+def _run_module(module_name):
+    """
+    Import and run one test module in a worker process.
+    
+    The module's output is captured so the parent can print it in order.
+    
+    Args:
+        module_name (str): Name of the test module to import
+    
+    Returns:
+        tuple: (output, success, results) from the module's run_tests()
+    """
+    output = io.StringIO()
+    with redirect_stdout(output):
+        test_module = importlib.import_module(module_name)
+        success, results = test_module.run_tests()
+    return output.getvalue(), success, results
 
 
 def run_all_tests():
@@ -28,18 +47,25 @@ def run_all_tests():
     print()
     
     test_modules = [
-        ("Processors", test_processors),
-        ("Extractors", test_extractors), 
-        ("Integration", test_integration)
+        ("Processors", "test_processors"),
+        ("Extractors", "test_extractors"), 
+        ("Integration", "test_integration")
     ]
     
     all_results = []
     total_passed = 0
     total_tests = 0
     
-    for module_name, test_module in test_modules:
+    # The modules are independent, so run them side by side and print
+    # each module's captured output in the usual order
+    with ProcessPoolExecutor(max_workers=len(test_modules)) as executor:
+        futures = [executor.submit(_run_module, test_module) for _, test_module in test_modules]
+        
+        module_outputs = [future.result() for future in futures]
+    
+    for (module_name, _), (output, success, results) in zip(test_modules, module_outputs):
         print(f"Running {module_name} Tests...")
-        success, results = test_module.run_tests()
+        print(output, end='')
         
         module_passed = sum(1 for _, passed, _ in results if passed)
         module_total = len(results)
@@ -72,7 +98,7 @@ def run_all_tests():
     
     # Show module breakdown
     print(f"\nMODULE BREAKDOWN:")
-    for module_name, test_module in test_modules:
+    for module_name, _ in test_modules:
         module_results = [(n, p, m) for mod, n, p, m in all_results if mod == module_name]
         module_passed = sum(1 for _, passed, _ in module_results if passed)
         module_total = len(module_results)
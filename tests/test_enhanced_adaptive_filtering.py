@@ -8,6 +8,7 @@ and shows more comprehensive results across many lines.
 """
 
 import sys
+import statistics
 
 from pathlib import Path
 
@@ -19,6 +20,13 @@ try:
 except ImportError:
     pdfplumber = None
 
+from char_cache import (
+    char_arrays,
+    get_chars_cached,
+    group_characters_by_line,
+    find_adjacent_non_space_indices,
+)
+
 
 def test_enhanced_adaptive_filtering(pdf_path, max_lines=20):
     """Test enhanced adaptive filtering with tab support."""
@@ -33,84 +41,49 @@ def test_enhanced_adaptive_filtering(pdf_path, max_lines=20):
     print(f"Showing first {max_lines} lines")
     
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            # Test first page
-            page = pdf.pages[0]
-            
-            # Get all characters with positions
-            chars = page.chars
+        # Get all characters with positions from the first page
+        chars = get_chars_cached(pdf_path)
+        
+        print(f"Found {len(chars)} characters")
+        
+        # Group characters by line
+        lines = group_characters_by_line(chars, line_tolerance=2.0)
+        
+        print(f"Grouped into {len(lines)} lines")
+        print()
+        
+        # Analyze the lines first, then report them. Each analysis depends
+        # only on its own line, so this map could be handed to an executor.
+        results = map(analyze_line, lines[:max_lines])
+        
+        # Show the enhanced adaptive filtering results for each line. The
+        # report is collected and written once, rather than with a print()
+        # call for every row.
+        report = []
+        for line_num, result in enumerate(results, 1):
+            report.append(f"LINE {line_num}:")
             
-            print(f"Found {len(chars)} characters")
+            # Show original text
+            report.append(f"  Original: '{result['original_text']}'")
             
-            # Group characters by line
-            lines = group_characters_by_line(chars, line_tolerance=2.0)
+            report.append(f"  Font analysis:")
+            report.append(f"    Avg char spacing: {result['avg_char_spacing']:.1f} pts")
+            report.append(f"    Min space threshold: {result['min_space_distance']:.1f} pts (remove spurious)")
+            report.append(f"    Add space threshold: {result['add_space_distance']:.1f} pts (0.9× space width)")
+            report.append(f"    Add tab threshold: {result['add_tab_distance']:.1f} pts (2.0× space width)")
             
-            print(f"Grouped into {len(lines)} lines")
-            print()
+            report.append(f"  Space+Tab: '{result['space_filtered']}'")
+            report.append(f"  Space+Pipe: '{result['pipe_filtered']}'")
             
-            # Process each line with enhanced adaptive filtering
-            for line_num, line_chars in enumerate(lines[:max_lines], 1):
-                print(f"LINE {line_num}:")
-                
-                # Show original text
-                original_text = ''.join(char['text'] for char in line_chars)
-                print(f"  Original: '{original_text}'")
-                
-                # Calculate character data
-                char_data = []
-                for char in line_chars:
-                    center = (char['x0'] + char['x1']) / 2
-                    char_data.append({
-                        'text': char['text'],
-                        'center': center,
-                        'is_space': char['text'] == ' '
-                    })
-                
-                # Calculate adaptive parameters for this line
-                avg_char_spacing = calculate_average_character_spacing(char_data)
-                
-                # Enhanced thresholds (much more aggressive)
-                min_space_distance = avg_char_spacing * 1.3  # Remove spurious spaces
-                # add_space_distance = avg_char_spacing * 0.54  # Add missing spaces (0.9× space width)  
-                add_space_distance = avg_char_spacing * 1.1
-                # add_tab_distance = avg_char_spacing * 1.20    # Add tabs (2.0× space width)
-                add_tab_distance = avg_char_spacing * 1.3
-                
-                print(f"  Font analysis:")
-                print(f"    Avg char spacing: {avg_char_spacing:.1f} pts")
-                print(f"    Min space threshold: {min_space_distance:.1f} pts (remove spurious)")
-                print(f"    Add space threshold: {add_space_distance:.1f} pts (0.9× space width)")
-                print(f"    Add tab threshold: {add_tab_distance:.1f} pts (2.0× space width)")
-                
-                # Apply enhanced filtering with different insertion characters
-                space_filtered = apply_enhanced_adaptive_filtering(
-                    char_data, 
-                    min_space_distance=min_space_distance,
-                    add_space_distance=add_space_distance,
-                    add_tab_distance=add_tab_distance,
-                    space_char=' ',
-                    tab_char='\t'
-                )
-                
-                # Also test with custom separator
-                pipe_filtered = apply_enhanced_adaptive_filtering(
-                    char_data, 
-                    min_space_distance=min_space_distance,
-                    add_space_distance=add_space_distance,
-                    add_tab_distance=add_tab_distance,
-                    space_char=' ',
-                    tab_char='|'  # Use pipe for visual clarity in testing
-                )
-                
-                print(f"  Space+Tab: '{space_filtered}'")
-                print(f"  Space+Pipe: '{pipe_filtered}'")
-                
-                # Show effectiveness
-                if original_text != space_filtered:
-                    print(f"  >>> CHANGED")
-                else:
-                    print(f"  >>> NO CHANGE NEEDED")
-                print()
+            # Show effectiveness
+            if result['original_text'] != result['space_filtered']:
+                report.append(f"  >>> CHANGED")
+            else:
+                report.append(f"  >>> NO CHANGE NEEDED")
+            report.append("")
+        
+        if report:
+            sys.stdout.write('\n'.join(report) + '\n')
         
         return True
         
@@ -119,150 +92,141 @@ def test_enhanced_adaptive_filtering(pdf_path, max_lines=20):
         return False
 
 
-def group_characters_by_line(chars, line_tolerance=2.0):
-    """Group characters into lines based on Y coordinate."""
-    if not chars:
-        return []
+def analyze_line(line_chars):
+    """
+    Run enhanced adaptive filtering on one line.
     
-    # Sort by Y coordinate (top to bottom), then X coordinate (left to right)
-    sorted_chars = sorted(chars, key=lambda c: (-c['y1'], c['x0']))
-    
-    lines = []
-    current_line = [sorted_chars[0]]
-    current_y = sorted_chars[0]['y1']
-    
-    for char in sorted_chars[1:]:
-        if abs(char['y1'] - current_y) <= line_tolerance:
-            # Same line - add to current group
-            current_line.append(char)
-        else:
-            # New line - start new group
-            lines.append(current_line)
-            current_line = [char]
-            current_y = char['y1']
-    
-    # Don't forget the last line
-    if current_line:
-        lines.append(current_line)
-    
-    # Sort characters within each line by X coordinate
-    for line in lines:
-        line.sort(key=lambda c: c['x0'])
-    
-    return lines
-
-
-def calculate_average_character_spacing(char_data):
+    Args:
+        line_chars (list): Characters in a line, sorted by X position
+        
+    Returns:
+        dict: Original text, adaptive thresholds and filtered text variants
+    """
+    # Calculate character data as parallel lists
+    texts, centers, is_space = char_arrays(line_chars)
+    
+    # Calculate adaptive parameters for this line
+    avg_char_spacing = calculate_average_character_spacing(centers, is_space)
+    
+    # Enhanced thresholds (much more aggressive)
+    min_space_distance = avg_char_spacing * 1.3  # Remove spurious spaces
+    # add_space_distance = avg_char_spacing * 0.54  # Add missing spaces (0.9× space width)  
+    add_space_distance = avg_char_spacing * 1.1
+    # add_tab_distance = avg_char_spacing * 1.20    # Add tabs (2.0× space width)
+    add_tab_distance = avg_char_spacing * 1.3
+    
+    # Apply enhanced filtering with different insertion characters
+    space_filtered = apply_enhanced_adaptive_filtering(
+        texts, centers, is_space, 
+        min_space_distance=min_space_distance,
+        add_space_distance=add_space_distance,
+        add_tab_distance=add_tab_distance,
+        space_char=' ',
+        tab_char='\t'
+    )
+    
+    # Also test with custom separator
+    pipe_filtered = apply_enhanced_adaptive_filtering(
+        texts, centers, is_space, 
+        min_space_distance=min_space_distance,
+        add_space_distance=add_space_distance,
+        add_tab_distance=add_tab_distance,
+        space_char=' ',
+        tab_char='|'  # Use pipe for visual clarity in testing
+    )
+    
+    return {
+        'original_text': ''.join(texts),
+        'avg_char_spacing': avg_char_spacing,
+        'min_space_distance': min_space_distance,
+        'add_space_distance': add_space_distance,
+        'add_tab_distance': add_tab_distance,
+        'space_filtered': space_filtered,
+        'pipe_filtered': pipe_filtered
+    }
+
+
+def calculate_average_character_spacing(centers, is_space):
     """Calculate the average spacing between adjacent non-space characters."""
-    non_space_chars = [c for c in char_data if not c['is_space']]
+    non_space_centers = [center for center, space in zip(centers, is_space) if not space]
     
-    if len(non_space_chars) < 2:
+    if len(non_space_centers) < 2:
         return 4.8  # Fallback to typical 12pt font spacing
     
-    # Calculate spacings between adjacent non-space characters
-    spacings = []
-    for i in range(1, len(non_space_chars)):
-        spacing = non_space_chars[i]['center'] - non_space_chars[i-1]['center']
-        # Only include reasonable spacings (filter out huge gaps)
-        if spacing > 0 and spacing < 50:  # Reasonable character spacing range
-            spacings.append(spacing)
+    # Spacings between adjacent non-space characters, keeping only the
+    # reasonable character spacing range (filter out huge gaps)
+    spacings = [s for a, b in zip(non_space_centers, non_space_centers[1:]) if 0 < (s := b - a) < 50]
     
     if not spacings:
         return 4.8  # Fallback
     
     # Use median to avoid being skewed by outliers
-    spacings.sort()
-    mid = len(spacings) // 2
-    if len(spacings) % 2 == 0:
-        return (spacings[mid-1] + spacings[mid]) / 2
-    else:
-        return spacings[mid]
+    return statistics.median(spacings)
 
 
-def apply_enhanced_adaptive_filtering(char_data, min_space_distance, add_space_distance, 
+def apply_enhanced_adaptive_filtering(texts, centers, is_space, min_space_distance, add_space_distance, 
                                      add_tab_distance, space_char=' ', tab_char='\t'):
     """Apply enhanced adaptive filtering with configurable insertion characters."""
-    if not char_data:
+    if not texts:
         return ""
     
-    result_chars = []
-    i = 0
+    # Lines with no space characters (common in PDFs that drop them) have
+    # nothing to filter, so the choice is made once for the whole line
+    if not any(is_space):
+        return insert_separators(texts, centers, add_space_distance, add_tab_distance, space_char, tab_char)
     
-    while i < len(char_data):
-        current_char = char_data[i]
-        
-        if current_char['is_space']:
-            # This is a space character - decide whether to keep it
-            if should_keep_space_enhanced(char_data, i, min_space_distance):
-                result_chars.append(space_char)
+    # Look up each space's neighbouring non-space characters by index
+    prev_nonspace, next_nonspace = find_adjacent_non_space_indices(is_space)
+    last_index = len(texts) - 1
+    result_chars = []
+    append = result_chars.append
+    
+    for i, text in enumerate(texts):
+        if is_space[i]:
+            # Keep the space if it lacks a neighbour on either side, or if the
+            # adjacent non-space characters are far enough apart
+            prev_index = prev_nonspace[i]
+            next_index = next_nonspace[i]
+            if (prev_index == -1 or next_index == -1 or
+                    centers[next_index] - centers[prev_index] >= min_space_distance):
+                append(space_char)
         else:
             # This is a non-space character - always add it
-            result_chars.append(current_char['text'])
+            append(text)
             
-            # Check if we need to add a separator after this character
-            separator = get_separator_to_add(char_data, i, add_space_distance, 
-                                           add_tab_distance, space_char, tab_char)
-            if separator:
-                result_chars.append(separator)
-        
-        i += 1
+            # Check what separator (if any) to add before the next character,
+            # unless this is the last character or a space already follows
+            if i < last_index and not is_space[i + 1]:
+                distance = centers[i + 1] - centers[i]
+                if distance >= add_tab_distance:
+                    append(tab_char)  # Large gap = structural boundary
+                elif distance >= add_space_distance:
+                    append(space_char)  # Medium gap = missing space
     
     return ''.join(result_chars)
 
 
-def should_keep_space_enhanced(char_data, space_index, min_space_distance):
-    """Determine if a space should be kept using adaptive threshold."""
-    # Find the non-space characters before and after this space
-    prev_char = None
-    next_char = None
-    
-    # Look backwards for previous non-space character
-    for i in range(space_index - 1, -1, -1):
-        if not char_data[i]['is_space']:
-            prev_char = char_data[i]
-            break
-    
-    # Look forwards for next non-space character
-    for i in range(space_index + 1, len(char_data)):
-        if not char_data[i]['is_space']:
-            next_char = char_data[i]
-            break
-    
-    # If we can't find both adjacent characters, keep the space
-    if prev_char is None or next_char is None:
-        return True
-    
-    # Calculate center-to-center distance between adjacent non-space characters
-    distance = next_char['center'] - prev_char['center']
-    
-    # Keep space if there's enough distance between the adjacent characters
-    return distance >= min_space_distance
-
-
-def get_separator_to_add(char_data, char_index, add_space_distance, 
-                        add_tab_distance, space_char, tab_char):
-    """Determine what separator (if any) should be added after a character."""
-    # Don't add separator after the last character
-    if char_index >= len(char_data) - 1:
-        return None
-    
-    current_char = char_data[char_index]
-    next_char = char_data[char_index + 1]
+def insert_separators(texts, centers, add_space_distance, add_tab_distance, space_char=' ', tab_char='\t'):
+    """
+    Join a line that has no space characters, adding separators at gaps.
     
-    # Don't add separator if next character is already a space
-    if next_char['is_space']:
-        return None
+    Specialized form of apply_enhanced_adaptive_filtering() for lines
+    without spaces, which only need the gap between each pair of
+    neighbouring characters.
+    """
+    result_chars = []
+    append = result_chars.append
     
-    # Calculate center-to-center distance
-    distance = next_char['center'] - current_char['center']
+    for text, center, next_center in zip(texts, centers, centers[1:]):
+        append(text)
+        distance = next_center - center
+        if distance >= add_tab_distance:
+            append(tab_char)  # Large gap = structural boundary
+        elif distance >= add_space_distance:
+            append(space_char)  # Medium gap = missing space
     
-    # Determine appropriate separator based on distance
-    if distance >= add_tab_distance:
-        return tab_char  # Large gap = structural boundary
-    elif distance >= add_space_distance:
-        return space_char  # Medium gap = missing space
-    else:
-        return None  # Small gap = no separator needed
+    append(texts[-1])
+    return ''.join(result_chars)
 
 
 def main():
@@ -14,6 +14,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from simple_pdf_scraper.extractors.pattern_extractor import PatternExtractor
 
+# PatternExtractor keeps no per-call state, so one instance is shared by
+# every test except the initialization test
+_EXTRACTOR = PatternExtractor()
+
 
 def test_pattern_extractor_initialization():
     """Test that PatternExtractor can be initialized."""
@@ -27,7 +31,7 @@ def test_pattern_extractor_initialization():
 def test_keyword_finding():
     """Test finding keywords in text."""
     try:
-        extractor = PatternExtractor()
+        extractor = _EXTRACTOR
         
         test_text = "Invoice Number: 12345\nTotal Amount: $567.89\nDate: 2024-01-15"
         
@@ -52,7 +56,7 @@ def test_keyword_finding():
 def test_right_direction_extraction():
     """Test extracting text to the right of a keyword."""
     try:
-        extractor = PatternExtractor()
+        extractor = _EXTRACTOR
         
         test_text = "Invoice Number: 12345 ABC"
         pattern = {
@@ -74,7 +78,7 @@ def test_right_direction_extraction():
 def test_left_direction_extraction():
     """Test extracting text to the left of a keyword."""
     try:
-        extractor = PatternExtractor()
+        extractor = _EXTRACTOR
         
         test_text = "ABC 12345 Total Amount"
         pattern = {
@@ -96,7 +100,7 @@ def test_left_direction_extraction():
 def test_below_direction_extraction():
     """Test extracting text below a keyword."""
     try:
-        extractor = PatternExtractor()
+        extractor = _EXTRACTOR
         
         test_text = "Invoice Details\nTotal: $100.50\nPayment Due"
         pattern = {
@@ -118,7 +122,7 @@ def test_below_direction_extraction():
 def test_above_direction_extraction():
     """Test extracting text above a keyword."""
     try:
-        extractor = PatternExtractor()
+        extractor = _EXTRACTOR
         
         test_text = "Company Name Inc\nInvoice #123\nPayment Due"
         pattern = {
@@ -140,7 +144,7 @@ def test_above_direction_extraction():
 def test_number_extraction():
     """Test extracting numbers specifically."""
     try:
-        extractor = PatternExtractor()
+        extractor = _EXTRACTOR
         
         test_text = "Total Amount: $1,234.56 USD"
         pattern = {
@@ -163,7 +167,7 @@ def test_number_extraction():
 def test_text_extraction():
     """Test extracting remaining text from position."""
     try:
-        extractor = PatternExtractor()
+        extractor = _EXTRACTOR
         
         test_text = "Description: High quality widgets for testing purposes"
         pattern = {
@@ -186,7 +190,7 @@ def test_text_extraction():
 def test_pattern_not_found():
     """Test handling when pattern is not found."""
     try:
-        extractor = PatternExtractor()
+        extractor = _EXTRACTOR
         
         test_text = "No relevant content here"
         pattern = {
@@ -208,7 +212,7 @@ def test_pattern_not_found():
 def test_multiple_patterns():
     """Test extracting multiple patterns from same text."""
     try:
-        extractor = PatternExtractor()
+        extractor = _EXTRACTOR
         
         test_text = "Invoice: 12345\nDate: 2024-01-15\nTotal: $567.89"
         patterns = [
@@ -242,6 +246,50 @@ def test_multiple_patterns():
         return False, f"Error testing multiple patterns: {e}"
 
 
+def test_prepared_text_reuse():
+    """Test extracting several patterns from text prepared once."""
+    try:
+        extractor = _EXTRACTOR
+        
+        test_text = "Invoice: 12345\nDate: 2024-01-15\nTotal: $567.89"
+        patterns = [
+            {
+                'keyword': 'Invoice:',
+                'direction': 'right',
+                'distance': 0,
+                'extract_type': 'word'
+            },
+            {
+                'keyword': 'Date:',
+                'direction': 'below',
+                'distance': 1,
+                'extract_type': 'line'
+            }
+        ]
+        
+        prepared = extractor.prepare(test_text)
+        
+        if extractor.prepare(prepared) is not prepared:
+            return False, "Preparing already prepared text should return it unchanged"
+        
+        expected = [extractor.extract_pattern(test_text, pattern) for pattern in patterns]
+        
+        single_results = [extractor.extract_pattern(prepared, pattern) for pattern in patterns]
+        if single_results != expected:
+            return False, f"Prepared results {single_results} differ from plain text results {expected}"
+        
+        multiple_results = extractor.extract_multiple_patterns(prepared, patterns)
+        if multiple_results != expected:
+            return False, f"Prepared multiple results {multiple_results} differ from {expected}"
+        
+        if expected != ["12345", "Total: $567.89"]:
+            return False, f"Unexpected results: {expected}"
+        
+        return True, "Prepared text reuse works"
+    except Exception as e:
+        return False, f"Error testing prepared text reuse: {e}"
+
+
 def run_tests():
     """Run all extractor tests and return results."""
     tests = [
@@ -254,7 +302,8 @@ def run_tests():
         test_number_extraction,
         test_text_extraction,
         test_pattern_not_found,
-        test_multiple_patterns
+        test_multiple_patterns,
+        test_prepared_text_reuse
     ]
     
     results = []
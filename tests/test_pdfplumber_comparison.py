@@ -7,7 +7,10 @@ Compare what level of text granularity we get from different PDF libraries
 to see if we can avoid the concatenation problem entirely.
 """
 
+import io
+import os
 import sys
+import mmap
 
 from pathlib import Path
 
@@ -25,6 +28,26 @@ except ImportError:
     PDFPLUMBER_AVAILABLE = False
 
 
+def map_pdf(pdf_file):
+    """
+    Memory-map a PDF file for reading.
+    
+    Both libraries seek around the file a lot while parsing, so reading
+    from a mapping serves those seeks from memory instead of going through
+    a buffered file object. The mapping stays valid after the file is closed.
+    
+    Returns:
+        mmap.mmap or io.BytesIO: Read-only mapping of the whole file, or an
+            empty buffer for an empty file (both usable as context managers)
+    """
+    with open(pdf_file, 'rb') as file:
+        # An empty file can't be mapped - hand the libraries an empty buffer
+        # so they report it like any other unreadable PDF
+        if os.fstat(file.fileno()).st_size == 0:
+            return io.BytesIO()
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
 def test_pypdf_extraction(pdf_file):
     """Test pypdf extraction (we know this concatenates)."""
     print("PYPDF EXTRACTION:")
@@ -35,12 +58,13 @@ def test_pypdf_extraction(pdf_file):
         return None
     
     try:
-        with open(pdf_file, 'rb') as file:
-            reader = pypdf.PdfReader(file)
+        with map_pdf(pdf_file) as pdf_map:
+            reader = pypdf.PdfReader(pdf_map)
             page = reader.pages[0]
             text = page.extract_text()
             
-            lines = text.splitlines()[:5]
+            # Only the first five line breaks need splitting for the preview
+            lines = text.split('\n', 5)[:5]
             print(f"First 5 lines:")
             for i, line in enumerate(lines, 1):
                 print(f"  {i}: '{line[:80]}{'...' if len(line) > 80 else ''}'")
@@ -63,21 +87,21 @@ def test_pdfplumber_characters(pdf_file):
         return None, None
     
     try:
-        with pdfplumber.open(pdf_file) as pdf:
+        with map_pdf(pdf_file) as pdf_map, pdfplumber.open(pdf_map) as pdf:
             page = pdf.pages[0]
             
-            # Get individual characters with positions
+            # Get individual characters with positions. pdfplumber builds the
+            # whole list at once, and extract_text() below reuses it.
             chars = page.chars
             
             print(f"Found {len(chars)} individual characters")
             print(f"Sample characters:")
             
-            # Show first 20 characters with positions
-            for i, char in enumerate(chars[:20]):
-                x = char['x0']
-                y = char['y0']
-                text = repr(char['text'])
-                print(f"  {i+1:2}: ({x:6.1f}, {y:6.1f}) {text}")
+            # Show first 20 characters with positions, printed in one call
+            sample_rows = [f"  {i:2}: ({char['x0']:6.1f}, {char['y0']:6.1f}) {char['text']!r}"
+                           for i, char in enumerate(chars[:20], 1)]
+            if sample_rows:
+                print('\n'.join(sample_rows))
             
             # Try to extract text normally for comparison
             text = page.extract_text()
@@ -99,7 +123,7 @@ def test_pdfplumber_words(pdf_file):
         return None
     
     try:
-        with pdfplumber.open(pdf_file) as pdf:
+        with map_pdf(pdf_file) as pdf_map, pdfplumber.open(pdf_map) as pdf:
             page = pdf.pages[0]
             
             # Get individual words with positions
@@ -108,12 +132,11 @@ def test_pdfplumber_words(pdf_file):
             print(f"Found {len(words)} individual words")
             print(f"Sample words:")
             
-            # Show first 15 words with positions  
-            for i, word in enumerate(words[:15]):
-                x = word['x0']
-                y = word['y0']
-                text = repr(word['text'])
-                print(f"  {i+1:2}: ({x:6.1f}, {y:6.1f}) {text}")
+            # Show first 15 words with positions, printed in one call
+            sample_rows = [f"  {i:2}: ({word['x0']:6.1f}, {word['y0']:6.1f}) {word['text']!r}"
+                           for i, word in enumerate(words[:15], 1)]
+            if sample_rows:
+                print('\n'.join(sample_rows))
             
             return words
             
@@ -131,54 +154,47 @@ def test_smart_reassembly(words):
         print("No words to reassemble")
         return ""
     
-    # Group words by line (same Y coordinate, with tolerance)
+    # Group words by line (same Y coordinate, with tolerance). Each new line
+    # is added to the list as soon as it starts, so there is no pending line
+    # to flush after the loop.
     lines = []
-    current_line = []
     current_y = None
     
     for word in words:
         y = word['y0']
         
-        # Start new line if Y changed significantly
+        # Start new line if Y changed significantly from the line's first word
         if current_y is None or abs(y - current_y) > 5:
-            if current_line:
-                lines.append(current_line)
             current_line = [word]
+            lines.append(current_line)
             current_y = y
         else:
             current_line.append(word)
     
-    # Don't forget the last line
-    if current_line:
-        lines.append(current_line)
-    
     print(f"Organized into {len(lines)} lines")
     
     # Reassemble with smart spacing within lines
     reassembled_lines = []
     
     for line_words in lines[:10]:  # Show first 10 lines
-        line_parts = []
+        line_parts = [line_words[0]['text']]
         
-        for i, word in enumerate(line_words):
-            line_parts.append(word['text'])
+        # Walk adjacent word pairs, adding spacing before each next word
+        for word, next_word in zip(line_words, line_words[1:]):
+            # Gap from the right edge of this word to the left edge of the next
+            gap = next_word['x0'] - word['x1']
             
-            # Add spacing logic for next word
-            if i < len(line_words) - 1:
-                next_word = line_words[i + 1]
-                
-                # Calculate gap between words
-                current_right = word['x1']  # Right edge of current word
-                next_left = next_word['x0']  # Left edge of next word
-                gap = next_left - current_right
-                
-                # Add space if there's a significant gap
-                if gap > 3:  # Configurable threshold
-                    line_parts.append(' ')
+            # Add space if there's a significant gap
+            if gap > 3:  # Configurable threshold
+                line_parts.append(' ')
+            line_parts.append(next_word['text'])
         
-        line_text = ''.join(line_parts)
-        reassembled_lines.append(line_text)
-        print(f"  Line: '{line_text[:80]}{'...' if len(line_text) > 80 else ''}'")
+        reassembled_lines.append(''.join(line_parts))
+    
+    # Show the reassembled lines, printed in one call
+    if reassembled_lines:
+        print('\n'.join(f"  Line: '{line_text[:80]}{'...' if len(line_text) > 80 else ''}'"
+                        for line_text in reassembled_lines))
     
     return '\n'.join(reassembled_lines)
 
@@ -201,32 +217,34 @@ def compare_extractions(pdf_file):
     else:
         smart_text = None
     
+    # Split each text into lines once and reuse the lists below
+    pypdf_lines = pypdf_text.splitlines() if pypdf_text else []
+    plumber_lines = pdfplumber_text.splitlines() if pdfplumber_text else []
+    smart_lines = smart_text.splitlines() if smart_text else []
+    
     # Compare results
     print(f"\nCOMPARISON SUMMARY:")
     print("=" * 40)
     
     if pypdf_text:
-        pypdf_lines = pypdf_text.splitlines()
         print(f"pypdf:      {len(pypdf_text)} chars, {len(pypdf_lines)} lines")
     
     if pdfplumber_text:
-        plumber_lines = pdfplumber_text.splitlines()
         print(f"pdfplumber: {len(pdfplumber_text)} chars, {len(plumber_lines)} lines")
     
     if smart_text:
-        smart_lines = smart_text.splitlines()
         print(f"smart:      {len(smart_text)} chars, {len(smart_lines)} lines")
     
     # Show the problematic line
     print(f"\nPROBLEMATIC LINE COMPARISON:")
-    if pypdf_text and len(pypdf_text.splitlines()) >= 3:
-        print(f"pypdf line 3:      '{pypdf_text.splitlines()[2]}'")
+    if len(pypdf_lines) >= 3:
+        print(f"pypdf line 3:      '{pypdf_lines[2]}'")
     
-    if pdfplumber_text and len(pdfplumber_text.splitlines()) >= 3:
-        print(f"pdfplumber line 3: '{pdfplumber_text.splitlines()[2]}'")
+    if len(plumber_lines) >= 3:
+        print(f"pdfplumber line 3: '{plumber_lines[2]}'")
     
-    if smart_text and len(smart_text.splitlines()) >= 3:
-        print(f"smart line 3:      '{smart_text.splitlines()[2]}'")
+    if len(smart_lines) >= 3:
+        print(f"smart line 3:      '{smart_lines[2]}'")
 
 
 def main():
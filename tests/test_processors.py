@@ -12,10 +12,30 @@ from pathlib import Path
 # Add parent directory to Python path to find the package
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import uuid
 import tempfile
 
+from functools import lru_cache
+
 from simple_pdf_scraper.processors.pypdf_processor import PyPDFProcessor
 
+# A file in the platform's temp directory that won't exist, unique per run
+# so parallel test runs can't collide
+MISSING_PDF = Path(tempfile.gettempdir()) / f"simple_pdf_scraper_missing_{uuid.uuid4().hex}.pdf"
+
+
+@lru_cache(maxsize=1)
+def _get_processor():
+    """
+    Get the PyPDFProcessor shared by the tests.
+    
+    The processor keeps no per-call state, so one instance serves every
+    test except the initialization check, which always constructs its own.
+    It is created on first use, so a failing constructor shows up as a
+    failed test rather than an import error.
+    """
+    return PyPDFProcessor()
+
 
 def test_pypdf_processor_initialization():
     """Test that PyPDFProcessor can be initialized."""
@@ -30,7 +50,7 @@ def test_pypdf_processor_inheritance():
     """Test that PyPDFProcessor properly inherits from PDFProcessor."""
     try:
         from simple_pdf_scraper.processors.base import PDFProcessor
-        processor = PyPDFProcessor()
+        processor = _get_processor()
         
         if isinstance(processor, PDFProcessor):
             return True, "PyPDFProcessor properly inherits from PDFProcessor"
@@ -43,7 +63,7 @@ def test_pypdf_processor_inheritance():
 def test_processor_methods_exist():
     """Test that required methods exist on the processor."""
     try:
-        processor = PyPDFProcessor()
+        processor = _get_processor()
         
         required_methods = ['extract_pages', 'extract_page', 'get_page_count', 'validate_pdf']
         missing_methods = []
@@ -63,7 +83,7 @@ def test_processor_methods_exist():
 def test_processor_info():
     """Test that processor info is available."""
     try:
-        processor = PyPDFProcessor()
+        processor = _get_processor()
         
         if hasattr(processor, 'get_processor_info'):
             info = processor.get_processor_info()
@@ -80,13 +100,10 @@ def test_processor_info():
 def test_file_not_found_handling():
     """Test handling of non-existent files."""
     try:
-        processor = PyPDFProcessor()
-        
-        # Test with a file that definitely doesn't exist
-        fake_file = "/tmp/definitely_does_not_exist_12345.pdf"
+        processor = _get_processor()
         
         try:
-            processor.extract_pages(fake_file)
+            processor.extract_pages(MISSING_PDF)
             return False, "Should have raised FileNotFoundError"
         except FileNotFoundError:
             return True, "Properly handles non-existent files"
@@ -99,7 +116,7 @@ def test_file_not_found_handling():
 def test_text_cleaning():
     """Test the internal text cleaning method."""
     try:
-        processor = PyPDFProcessor()
+        processor = _get_processor()
         
         # Test text with multiple spaces and empty lines
         test_text = "   Multiple    spaces   \n\n  \n  Another line  \n\n"
@@ -107,10 +124,15 @@ def test_text_cleaning():
         
         # Should have normalized spaces and removed empty lines
         lines = cleaned.split('\n')
-        if len(lines) == 2 and "Multiple spaces" in lines[0] and "Another line" in lines[1]:
-            return True, "Text cleaning works correctly"
-        else:
+        if not (len(lines) == 2 and "Multiple spaces" in lines[0] and "Another line" in lines[1]):
             return False, f"Text cleaning failed: got {repr(cleaned)}"
+        
+        # Tabs, carriage returns and other whitespace count as spaces too
+        cleaned = processor._clean_text("Tab\tseparated\r\n\x0c\n\u00a0Non-breaking\u00a0 space")
+        if cleaned != "Tab separated\nNon-breaking space":
+            return False, f"Whitespace cleaning failed: got {repr(cleaned)}"
+        
+        return True, "Text cleaning works correctly"
     except Exception as e:
         return False, f"Error testing text cleaning: {e}"
 
@@ -4,11 +4,19 @@ Tune pdfplumber gap detection thresholds.
 File: tests/tune_pdfplumber_gaps.py
 
 Test different gap thresholds to find optimal settings for specific PDFs.
+The grid sweeps the processor's fixed-mode center distances: the
+min_space_distance an existing space needs to be kept, and the
+add_space_distance at which a missing space is added.
 """
 
+import os
 import sys
+import heapq
 
 from pathlib import Path
+from functools import lru_cache
+from itertools import repeat, product
+from concurrent.futures import ProcessPoolExecutor
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -20,76 +28,123 @@ except ImportError:
     sys.exit(1)
 
 
-def test_gap_settings(pdf_file, char_gaps, word_gaps):
-    """Test different gap threshold combinations."""
+def test_gap_settings(pdf_file, min_space_distances, add_space_distances, quiet=False):
+    """Test different gap threshold combinations (quiet: skip the per-setting reports)."""
     
     print(f"TESTING GAP SETTINGS: {Path(pdf_file).name}")
     print("=" * 60)
     
+    # Every combination is independent, so they are scored in worker
+    # processes and their reports printed in grid order. Each worker gets
+    # one run of settings, so it parses the PDF only once.
+    settings = list(product(min_space_distances, add_space_distances))
+    workers = min(os.cpu_count() or 1, len(settings)) or 1
+    chunk_size = -(-len(settings) // workers) or 1
+    chunks = [settings[start:start + chunk_size] for start in range(0, len(settings), chunk_size)]
+    
     results = []
     
-    for char_gap in char_gaps:
-        for word_gap in word_gaps:
-            print(f"\nTesting char_gap={char_gap}, word_gap={word_gap}")
-            print("-" * 30)
-            
-            try:
-                processor = PDFPlumberProcessor(
-                    char_gap_threshold=char_gap,
-                    word_gap_threshold=word_gap
-                )
-                
-                # Extract first page
-                pages = processor.extract_pages(pdf_file)
-                if not pages:
-                    print("✗ No text extracted")
-                    continue
-                
-                text = pages[0]
-                lines = text.splitlines()
-                
-                # Find the problematic line
-                problem_line = None
-                for line in lines:
-                    if "LINEAGE TRANSPORTATION LLC" in line:
-                        problem_line = line
-                        break
-                
-                if problem_line:
-                    print(f"Result: '{problem_line[:80]}{'...' if len(problem_line) > 80 else ''}'")
-                    
-                    # Score the result
-                    score = score_line_quality(problem_line)
-                    print(f"Score: {score}/10")
-                    
-                    results.append({
-                        'char_gap': char_gap,
-                        'word_gap': word_gap, 
-                        'line': problem_line,
-                        'score': score
-                    })
-                else:
-                    print("✗ Problematic line not found")
-                    
-            except Exception as e:
-                print(f"✗ Error: {e}")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_results in executor.map(_score_gap_settings, repeat(pdf_file), chunks):
+            for report, result in chunk_results:
+                if not quiet:
+                    print(report)
+                if result is not None:
+                    results.append(result)
     
     # Show best results
     if results:
-        print(f"\n\nBEST RESULTS:")
-        print("=" * 60)
+        # Select the top scores without sorting every result (ties keep
+        # grid order, as with a stable descending sort)
+        best_results = heapq.nlargest(3, results, key=lambda x: x['score'])
+        
+        # Format the whole table first and print it in one call, each entry
+        # followed by a blank line
+        entries = [f"{i+1}. Score {result['score']}/10 - min_space_distance={result['min_space_distance']}, "
+                   f"add_space_distance={result['add_space_distance']}\n"
+                   f"   '{result['line'][:100]}{'...' if len(result['line']) > 100 else ''}'\n"
+                   for i, result in enumerate(best_results)]
+        print(f"\n\nBEST RESULTS:\n{'=' * 60}\n" + '\n'.join(entries))
+
+
+def _score_gap_settings(pdf_file, settings):
+    """
+    Process pool worker - score a run of settings against one parse of page 1.
+    
+    Returns:
+        list: (report, result) tuples as from _score_gap_setting(), in order
+    """
+    try:
+        # Only the first page is scored, so don't extract the rest
+        with PDFPlumberProcessor().open_page(pdf_file, 1) as page:
+            return [_score_gap_setting(page, min_space_distance, add_space_distance)
+                    for min_space_distance, add_space_distance in settings]
+    except Exception as e:
+        return [('\n'.join(_report_header(min_space_distance, add_space_distance) + [f"✗ Error: {e}"]), None)
+                for min_space_distance, add_space_distance in settings]
+
+
+def _report_header(min_space_distance, add_space_distance):
+    """Build the heading lines of one setting's report."""
+    return [f"\nTesting min_space_distance={min_space_distance}, add_space_distance={add_space_distance}",
+            "-" * 30]
+
+
+def _score_gap_setting(page, min_space_distance, add_space_distance):
+    """
+    Extract and score the problem line of an open page for one setting.
+    
+    Returns:
+        tuple: (report, result) - the report text to print, and the result
+            dict, or None if the line could not be scored
+    """
+    report = _report_header(min_space_distance, add_space_distance)
+    
+    try:
+        processor = PDFPlumberProcessor(
+            min_space_distance=min_space_distance,
+            add_space_distance=add_space_distance
+        )
+        
+        text = processor.extract_page_text(page)
+        if not text:
+            report.append("✗ No text extracted")
+            return '\n'.join(report), None
+        
+        # Find the problematic line with one search of the whole text, then
+        # widen the match out to the newlines around it
+        match_pos = text.find("LINEAGE TRANSPORTATION LLC")
+        if match_pos == -1:
+            report.append("✗ Problematic line not found")
+            return '\n'.join(report), None
+        
+        line_start = text.rfind('\n', 0, match_pos) + 1
+        line_end = text.find('\n', match_pos)
+        if line_end == -1:
+            line_end = len(text)
+        problem_line = text[line_start:line_end]
         
-        # Sort by score (descending)
-        results.sort(key=lambda x: x['score'], reverse=True)
+        report.append(f"Result: '{problem_line[:80]}{'...' if len(problem_line) > 80 else ''}'")
         
-        for i, result in enumerate(results[:3]):
-            print(f"{i+1}. Score {result['score']}/10 - char_gap={result['char_gap']}, word_gap={result['word_gap']}")
-            print(f"   '{result['line'][:100]}{'...' if len(result['line']) > 100 else ''}'")
-            print()
+        # Score the result
+        score = score_line_quality(problem_line)
+        report.append(f"Score: {score}/10")
+        
+        return '\n'.join(report), {
+            'min_space_distance': min_space_distance,
+            'add_space_distance': add_space_distance,
+            'line': problem_line,
+            'score': score
+        }
+        
+    except Exception as e:
+        report.append(f"✗ Error: {e}")
+        return '\n'.join(report), None
 
 
+@lru_cache(maxsize=512)
 def score_line_quality(line):
-    """Score how well a line is formatted (0-10)."""
+    """Score how well a line is formatted (0-10), reusing scores of repeated lines."""
     score = 10
     
     # Penalize obvious formatting issues
@@ -121,29 +176,37 @@ def main():
     print("PDFPlumber Gap Tuning Tool")
     print("=" * 40)
     
-    if len(sys.argv) != 2:
-        print("Usage: python tune_pdfplumber_gaps.py <pdf_file>")
+    args = sys.argv[1:]
+    quiet = False
+    if len(args) == 2 and args[1] in ('-q', '--quiet'):
+        quiet = True
+        args = args[:1]
+    
+    if len(args) != 1:
+        print("Usage: python tune_pdfplumber_gaps.py <pdf_file> [-q|--quiet]")
         print("\nTest different gap thresholds to find optimal settings")
+        print("With --quiet, only the best results are shown")
         return 1
     
-    pdf_file = sys.argv[1]
+    pdf_file = args[0]
     
     if not Path(pdf_file).exists():
         print(f"Error: File not found: {pdf_file}")
         return 1
     
-    # Test different gap combinations
-    char_gaps = [1.0, 2.0, 3.0, 4.0, 5.0]
-    word_gaps = [6.0, 8.0, 10.0, 12.0, 15.0]
+    # Test different gap combinations, in points between character centers
+    # (the fixed-mode defaults are 6.0 and 5.3)
+    min_space_distances = [4.0, 5.0, 6.0, 7.0, 8.0]
+    add_space_distances = [5.0, 6.0, 7.0, 8.0, 9.0]
     
-    test_gap_settings(pdf_file, char_gaps, word_gaps)
+    test_gap_settings(pdf_file, min_space_distances, add_space_distances, quiet)
     
     print("\nRECOMMENDATIONS:")
     print("=" * 40)
     print("- Use the highest scoring settings")
-    print("- char_gap controls spacing within words/numbers")  
-    print("- word_gap controls spacing between distinct elements")
-    print("- Lower values = less spacing, higher values = more spacing")
+    print("- min_space_distance decides which existing spaces are kept")
+    print("- add_space_distance decides where missing spaces are added")
+    print("- Lower values = more spacing, higher values = less spacing")
     
     return 0
 